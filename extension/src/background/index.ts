@@ -4,7 +4,7 @@
 
 import { wsClient } from '../websocket/client';
 import { computer } from '../commands/computer';
-import { captureScreenshot } from '../commands/screenshot';
+import { captureScreenshot, hashImageData } from '../commands/screenshot';
 import { tabs } from '../commands/tabs';
 import { tabManager } from '../commands/tab-manager';
 import { debuggerManager } from '../commands/debugger-manager';
@@ -502,24 +502,24 @@ async function handleCommand(command: Command): Promise<CommandResponse> {
         // ========================================
         let originalFocusedWindow: chrome.windows.Window | null = null;
         
-        try {
-          // Get currently focused window
-          const focusedWindow = await chrome.windows.getLastFocused({ populate: false });
-          if (focusedWindow && focusedWindow.focused) {
-            originalFocusedWindow = focusedWindow;
-            console.log(`📸 [Screenshot Command] Saved focused window: ${focusedWindow.id}`);
-          }
-        } catch (error) {
-          console.warn('📸 [Screenshot Command] Could not get focused window:', error);
-        }
-        
         // Set global screenshot tracking flag
         isScreenshotInProgress = true;
         screenshotStartTime = Date.now();
         lastScreenshotTabId = tabIdForScreenshot;
         
-        // Ensure tab is managed by tab manager
-        await tabManager.ensureTabManaged(tabIdForScreenshot);
+        // Get the currently focused window and ensure the tab is managed by
+        // tab manager concurrently - the two lookups are independent
+        const [focusedWindow] = await Promise.all([
+          chrome.windows.getLastFocused({ populate: false }).catch((error) => {
+            console.warn('📸 [Screenshot Command] Could not get focused window:', error);
+            return null;
+          }),
+          tabManager.ensureTabManaged(tabIdForScreenshot),
+        ]);
+        if (focusedWindow && focusedWindow.focused) {
+          originalFocusedWindow = focusedWindow;
+          console.log(`📸 [Screenshot Command] Saved focused window: ${focusedWindow.id}`);
+        }
         // Update tab activity for status tracking
         tabManager.updateTabActivity(tabIdForScreenshot);
         
@@ -536,7 +536,8 @@ async function handleCommand(command: Command): Promise<CommandResponse> {
             command.include_cursor !== false,
             command.quality || 90,
             true, // resizeToPreset
-            0    // waitForRender: no need to wait since tab is not activated
+            0,   // waitForRender: no need to wait since tab is not activated
+            command.format
           );
           
           const screenshotDuration = Date.now() - screenshotStartTime;
@@ -550,29 +551,29 @@ async function handleCommand(command: Command): Promise<CommandResponse> {
           // ========================================
           // CRITICAL FIX: Restore window focus after screenshot
           // ========================================
+          // Done in the background so the captured image is returned
+          // without waiting for the settle delay
           if (originalFocusedWindow) {
-            // Small delay to let Chrome settle
-            await new Promise(resolve => setTimeout(resolve, 100));
-            
-            try {
-              // Check if window still exists and needs refocusing
-              const currentFocused = await chrome.windows.getLastFocused({ populate: false });
-              if (currentFocused && currentFocused.id !== originalFocusedWindow.id) {
-                console.log(`📸 [Screenshot Command] Restoring focus to window ${originalFocusedWindow.id} (current: ${currentFocused.id})`);
-                await chrome.windows.update(originalFocusedWindow.id, { focused: true });
-                console.log(`✅ [Screenshot Command] Focus restored`);
-              } else {
-                console.log(`📸 [Screenshot Command] Focus already correct, no need to restore`);
-              }
-            } catch (restoreError) {
-              console.warn('📸 [Screenshot Command] Could not restore window focus:', restoreError);
-            }
+            restoreWindowFocus(originalFocusedWindow.id!).catch(console.error);
+          }
+          
+          // Skip re-sending a frame the server already holds
+          const imageHash = hashImageData(screenshotResult.imageData);
+          if (command.known_hash && command.known_hash === imageHash) {
+            const { imageData: _unchangedImage, ...unchangedResult } = screenshotResult;
+            return {
+              success: true,
+              message: 'Screenshot unchanged since last capture',
+              data: { ...unchangedResult, imageHash, unchanged: true },
+              timestamp: Date.now(),
+              duration: screenshotDuration,
+            };
           }
           
           return {
             success: true,
             message: 'Screenshot captured (background, no tab activation, focus preserved)',
-            data: screenshotResult,
+            data: { ...screenshotResult, imageHash },
             timestamp: Date.now(),
             duration: screenshotDuration,
           };
@@ -819,6 +820,28 @@ async function handleCommand(command: Command): Promise<CommandResponse> {
   }
 }
 
+/**
+ * Refocus the window that was focused before a screenshot, if Chrome moved focus
+ */
+async function restoreWindowFocus(windowId: number): Promise<void> {
+  // Small delay to let Chrome settle
+  await new Promise(resolve => setTimeout(resolve, 100));
+  
+  try {
+    // Check if window still exists and needs refocusing
+    const currentFocused = await chrome.windows.getLastFocused({ populate: false });
+    if (currentFocused && currentFocused.id !== windowId) {
+      console.log(`📸 [Screenshot Command] Restoring focus to window ${windowId} (current: ${currentFocused.id})`);
+      await chrome.windows.update(windowId, { focused: true });
+      console.log(`✅ [Screenshot Command] Focus restored`);
+    } else {
+      console.log(`📸 [Screenshot Command] Focus already correct, no need to restore`);
+    }
+  } catch (restoreError) {
+    console.warn('📸 [Screenshot Command] Could not restore window focus:', restoreError);
+  }
+}
+
 /**
  * Get current active tab ID
  */
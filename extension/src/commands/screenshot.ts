@@ -4,9 +4,29 @@
  */
 
 import { cacheScreenshotMetadata } from './computer';
+import type { ScreenshotFormat } from '../types';
 import { CdpCommander } from './cdp-commander';
 import { debuggerManager } from './debugger-manager';
 
+/**
+ * Fast non-cryptographic hash (cyrb53) of the encoded image data.
+ *
+ * Used to recognise a frame identical to one the server already has, so the
+ * image payload can be left out of the response instead of re-sent.
+ */
+export function hashImageData(data: string): string {
+  let h1 = 0xdeadbeef;
+  let h2 = 0x41c6ce57;
+  for (let i = 0; i < data.length; i++) {
+    const ch = data.charCodeAt(i);
+    h1 = Math.imul(h1 ^ ch, 2654435761);
+    h2 = Math.imul(h2 ^ ch, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16);
+}
+
 /**
  * Resize image using OffscreenCanvas and createImageBitmap
  * 
@@ -20,6 +40,8 @@ async function resizeImage(
   dataUrl: string,
   targetWidth: number = 1280,
   targetHeight: number = 720,
+  format: ScreenshotFormat = 'png',
+  quality: number = 90,
 ): Promise<string> {
   console.log(`🖼️ [Screenshot] Resizing image to ${targetWidth}x${targetHeight}...`);
   
@@ -86,8 +108,10 @@ async function resizeImage(
     // Draw ImageBitmap to canvas with scaling and centering
     ctx.drawImage(imageBitmap, offsetX, offsetY, newWidth, newHeight);
     
-    // Convert to data URL (PNG format for lossless quality)
-    const resizedBlob = await canvas.convertToBlob({ type: 'image/png' });
+    // Convert to data URL (PNG is lossless; JPEG/WebP are far smaller for UI screenshots)
+    const resizedBlob = format === 'png'
+      ? await canvas.convertToBlob({ type: 'image/png' })
+      : await canvas.convertToBlob({ type: `image/${format}`, quality: quality / 100 });
     
     // Convert Blob to data URL using FileReader
     return new Promise((resolve, reject) => {
@@ -120,9 +144,13 @@ async function captureScreenshotWithCDP(
   quality: number = 90,
   resizeToPreset: boolean = true,
   waitForRender: number = 500,
+  format?: ScreenshotFormat,
 ): Promise<any> {
   console.log(`📸 [Screenshot] Capturing screenshot via CDP for tab ${tabId}`);
   
+  // Without an explicit format, quality < 90 selects JPEG (legacy behavior)
+  const imageFormat: ScreenshotFormat = format ?? (quality < 90 ? 'jpeg' : 'png');
+  
   // Ensure debugger is attached
   const attached = await debuggerManager.safeAttachDebugger(tabId);
   if (!attached) {
@@ -238,8 +266,9 @@ async function captureScreenshotWithCDP(
     let screenshot: any;
     try {
       screenshot = await cdpCommander.sendCommand<any>('Page.captureScreenshot', {
-        format: quality < 90 ? 'jpeg' : 'png',
-        quality: quality < 90 ? quality / 100 : undefined,
+        format: imageFormat,
+        // CDP takes an integer 0-100 quality for lossy formats
+        quality: imageFormat === 'png' ? undefined : quality,
         fromSurface: true,
         clip: {
           x: cssViewportX,
@@ -259,7 +288,7 @@ async function captureScreenshotWithCDP(
       throw new Error('[Screenshot] Page.captureScreenshot returned no data');
     }
     
-    const dataUrl = `data:image/${quality < 90 ? 'jpeg' : 'png'};base64,${screenshot.data}`;
+    const dataUrl = `data:image/${imageFormat};base64,${screenshot.data}`;
     
     if (!dataUrl.startsWith('data:image/')) {
       throw new Error('[Screenshot] Invalid image data format from CDP');
@@ -300,7 +329,9 @@ async function captureScreenshotWithCDP(
         finalImageData = await resizeImage(
           dataUrl,
           PRESET_WIDTH,
-          PRESET_HEIGHT
+          PRESET_HEIGHT,
+          imageFormat,
+          quality
         );
         finalImageWidth = PRESET_WIDTH;
         finalImageHeight = PRESET_HEIGHT;
@@ -348,6 +379,7 @@ async function captureScreenshotWithCDP(
         url: tab?.url || '',
         title: tab?.title || '',
         resizedToPreset: resizeToPreset,
+        format: imageFormat,
         captureMethod: 'cdp',
         devicePixelRatio: devicePixelRatio,
       },
@@ -400,6 +432,7 @@ function _captureScreenshotLegacy(): never {
  * @param quality Image quality (1-100)
  * @param resizeToPreset Whether to resize to 1280x720
  * @param waitForRender Time to wait for rendering in ms
+ * @param format Image format (defaults to PNG, or JPEG when quality < 90)
  * @returns Screenshot data with metadata
  */
 export async function captureScreenshot(
@@ -408,6 +441,7 @@ export async function captureScreenshot(
   quality: number = 90,
   resizeToPreset: boolean = true,
   waitForRender: number = 500,
+  format?: ScreenshotFormat,
 ): Promise<any> {
   // Resolve tab ID if not provided
   let targetTabId = tabId;
@@ -452,7 +486,8 @@ export async function captureScreenshot(
     includeCursor,
     quality,
     resizeToPreset,
-    waitForRender
+    waitForRender,
+    format
   );
   
   console.log(`✅ [Screenshot] Screenshot captured successfully for tab ${targetTabId}`);
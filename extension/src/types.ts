@@ -44,12 +44,16 @@ export interface KeyboardPressCommand extends BaseCommand {
   modifiers?: string[];
 }
 
+export type ScreenshotFormat = 'png' | 'jpeg' | 'webp';
+
 export interface ScreenshotCommand extends BaseCommand {
   type: 'screenshot';
   tab_id?: number;
   include_cursor?: boolean;
   quality?: number;
   include_visual_mouse?: boolean;
+  format?: ScreenshotFormat;
+  known_hash?: string;
 }
 
 export interface TabCommand extends BaseCommand {
@@ -6,17 +6,27 @@ through natural language commands with real-time visual feedback.
 """
 
 import asyncio
-import json
+import functools
+import inspect
 import logging
-import uuid
+import struct
 import threading
-import queue
+import uuid
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, AsyncGenerator
+from typing import Dict, Deque, List, Any, Callable, Optional, Union, AsyncGenerator
+from collections import deque
 from collections.abc import Sequence
-
+try:
+    # libuv-based event loop, when installed (uvicorn[standard] brings it in)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+import msgpack
+import orjson
 from openhands.sdk import (
     LLM,
     Agent,
@@ -51,7 +61,7 @@ from openhands.tools.file_editor import FileEditorTool
 from openhands.tools.terminal import TerminalTool
 from openhands.tools.task_tracker import TaskTrackerTool
 from openhands.tools.preset.default import get_default_condenser
-from .tools.open_browser_tool import OpenBrowserTool
+from .tools.open_browser_tool import OpenBrowserTool, data_url_mime, decode_data_url
 from server.core.llm_config import llm_config_manager
 
 logger = get_logger(__name__)
@@ -59,47 +69,233 @@ logger = get_logger(__name__)
 
 # --- SSE Event Types ---
 
+# Media type a client sends in its Accept header to receive length-prefixed
+# MessagePack frames instead of text/event-stream
+MSGPACK_SSE_MEDIA_TYPE = "application/msgpack-sse"
+
+
+@dataclass(slots=True, frozen=True)
 class SSEEvent:
     """Server-Sent Event for streaming responses"""
     
-    def __init__(self, event_type: str, data: Any):
-        self.event_type = event_type
-        self.data = data
+    event_type: str
+    data: Any
     
-    def to_sse_format(self) -> str:
-        """Convert to SSE format string"""
+    def to_sse_format(self) -> bytes:
+        """Convert to an SSE frame (UTF-8 bytes)"""
         if isinstance(self.data, str):
-            data_str = self.data
+            data_bytes = self.data.encode()
         else:
-            data_str = json.dumps(self.data, ensure_ascii=False)
+            # orjson always emits UTF-8 and is much faster than json.dumps on
+            # the large base64 screenshot strings carried in "image". Its
+            # output never contains a raw newline (they are escaped inside
+            # strings), so no extra escaping pass is needed.
+            data_bytes = orjson.dumps(self.data)
         
-        # Escape newlines in data
-        data_str = data_str.replace('\n', '\\n')
+        event = self.event_type.encode()
+        if b"\n" not in data_bytes:
+            return b"event: %s\ndata: %s\n\n" % (event, data_bytes)
         
-        return f"event: {self.event_type}\ndata: {data_str}\n\n"
+        # Multi-line text: one data line per line, which SSE clients re-join
+        # with "\n"
+        data_lines = b"".join(b"data: %s\n" % line for line in data_bytes.split(b"\n"))
+        return b"event: %s\n%s\n" % (event, data_lines)
+
+    def to_msgpack_frame(self) -> bytes:
+        """Convert to a MessagePack frame with a 4-byte big-endian length prefix
+        
+        A base64 screenshot data URL in "image" is unpacked to raw image bytes,
+        which msgpack carries natively as bin instead of base64 text.
+        """
+        data = self.data
+        image = data.get("image") if isinstance(data, dict) else None
+        image_mime = data_url_mime(image) if isinstance(image, str) else None
+        if image_mime is not None:
+            data = dict(data)
+            data["image"] = decode_data_url(image)
+            data["image_mime"] = image_mime
+        
+        payload = msgpack.packb(
+            {"event": self.event_type, "data": data},
+            use_bin_type=True,
+        )
+        return struct.pack(">I", len(payload)) + payload
+
+
+# --- Per-type SSE field extraction ---
+
+# Observation attributes copied into SSE data when present on the observation type
+_OBSERVATION_FIELDS = ("success", "message", "error")
+# Observation attributes that may carry an image, in order of preference
+# (screenshot_data_url is what the open_browser tool produces)
+_OBSERVATION_IMAGE_FIELDS = ("screenshot_data_url", "image_url", "image")
+
+# Cache: observation type -> (fields present, image fields present)
+_OBSERVATION_SCHEMAS: Dict[type, tuple] = {}
+# Cache: event type -> callable returning the type-specific SSE fields
+_EVENT_EXTRACTORS: Dict[type, Callable[[Event], Dict[str, Any]]] = {}
+
+
+def _observation_schema(obs: Any) -> tuple:
+    """Return the (fields, image_fields) present on this observation's type"""
+    schema = _OBSERVATION_SCHEMAS.get(type(obs))
+    if schema is None:
+        # Probe once per observation type; later observations of the same type
+        # read exactly these attributes
+        schema = (
+            tuple(name for name in _OBSERVATION_FIELDS if hasattr(obs, name)),
+            tuple(name for name in _OBSERVATION_IMAGE_FIELDS if hasattr(obs, name)),
+        )
+        _OBSERVATION_SCHEMAS[type(obs)] = schema
+    return schema
+
+
+def _extract_action_fields(event: ActionEvent) -> Dict[str, Any]:
+    """ActionEvent has action and summary attributes"""
+    fields = {}
+    if event.action:
+        fields["action"] = str(event.action)
+    if event.summary:
+        fields["summary"] = str(event.summary)
+    return fields
+
+
+def _extract_observation_fields(event: ObservationEvent) -> Dict[str, Any]:
+    """ObservationEvent has an observation with possible image content"""
+    obs = event.observation
+    field_names, image_names = _observation_schema(obs)
+    fields = {name: getattr(obs, name) for name in field_names}
+    
+    # Check for image content in observations (especially for open_browser tool)
+    for name in image_names:
+        image = getattr(obs, name)
+        if image:
+            fields["image"] = image
+            break
+    return fields
+
+
+def _extract_message_fields(event: MessageEvent) -> Dict[str, Any]:
+    """MessageEvent has llm_message with role information"""
+    fields = {"role": event.llm_message.role}
+    # Also include activated_skills if present
+    if event.activated_skills:
+        fields["activated_skills"] = event.activated_skills
+    if event.sender:
+        fields["sender"] = event.sender
+    return fields
+
+
+def _extract_no_fields(event: Event) -> Dict[str, Any]:
+    """Events without type-specific SSE fields"""
+    return {}
+
+
+def _build_event_extractor(event_type: type) -> Callable[[Event], Dict[str, Any]]:
+    """Resolve and cache the SSE field extractor for an event type
+    
+    ActionEvent, ObservationEvent and MessageEvent are mutually exclusive, so
+    the first matching base class decides the extractor.
+    """
+    if issubclass(event_type, ActionEvent):
+        extractor = _extract_action_fields
+    elif issubclass(event_type, ObservationEvent):
+        extractor = _extract_observation_fields
+    elif issubclass(event_type, MessageEvent):
+        extractor = _extract_message_fields
+    else:
+        extractor = _extract_no_fields
+    _EVENT_EXTRACTORS[event_type] = extractor
+    return extractor
 
 
 # --- Queue-based Visualizer for SSE Streaming ---
 
+# Maximum number of SSE events buffered per conversation before the oldest
+# ones are dropped (bounds memory when the HTTP client reads slowly)
+EVENT_QUEUE_MAXSIZE = 256
+
+
 class QueueVisualizer(ConversationVisualizerBase):
-    """Visualizer that puts events into a queue for SSE streaming"""
+    """Visualizer that puts events into a queue for SSE streaming
     
-    def __init__(self, event_queue: queue.Queue = None):
+    The queue is a single-producer/single-consumer handoff: the conversation
+    thread appends to a deque and the SSE coroutine pops from it, woken by an
+    asyncio.Event. deque append/popleft are atomic under the GIL, so no lock is
+    taken per event.
+    """
+    
+    def __init__(
+        self,
+        event_queue: Optional[Deque[SSEEvent]] = None,
+        wake: Optional[asyncio.Event] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
         """
         Args:
-            event_queue: queue.Queue to put visualized events into (can be set later)
+            event_queue: deque to put visualized events into (can be set later)
+            wake: event set (on loop) whenever event_queue gets new items
+            loop: event loop that owns wake
         """
         super().__init__()
         self.event_queue = event_queue
+        self._wake = wake
+        self._loop = loop
+        # Number of events dropped because the queue was full
+        self.dropped_events = 0
+        # Whether the consumer's wire format carries binary (MessagePack), in
+        # which case screenshots are queued as raw image bytes
+        self.binary_images = False
     
-    def set_event_queue(self, event_queue: queue.Queue) -> None:
+    def set_event_queue(
+        self,
+        event_queue: Optional[Deque[SSEEvent]],
+        wake: Optional[asyncio.Event] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        binary_images: bool = False,
+    ) -> None:
         """Set the event queue (useful for delayed initialization)"""
         self.event_queue = event_queue
+        self._wake = wake
+        self._loop = loop
+        self.dropped_events = 0
+        self.binary_images = binary_images
+    
+    def put_event(self, sse_event: SSEEvent) -> None:
+        """Append an event and wake the consumer (safe to call from any thread)
+        
+        If the queue is full the oldest event is dropped. Events without a
+        screenshot are dropped first so the frontend's live view keeps up even
+        while lagging.
+        """
+        event_queue, wake, loop = self.event_queue, self._wake, self._loop
+        if event_queue is None or wake is None or loop is None or loop.is_closed():
+            return
+        
+        if len(event_queue) >= EVENT_QUEUE_MAXSIZE:
+            try:
+                victim = next(
+                    (queued for queued in event_queue
+                     if not (isinstance(queued.data, dict) and "image" in queued.data)),
+                    None,
+                )
+                if victim is not None:
+                    event_queue.remove(victim)
+                else:
+                    event_queue.popleft()
+                self.dropped_events += 1
+            except (RuntimeError, ValueError, IndexError):
+                # The consumer drained the queue concurrently, so there is room
+                pass
+        
+        event_queue.append(sse_event)
+        # The consumer clears wake before re-checking the deque, so skipping
+        # the cross-thread call while it is still set cannot lose a wakeup
+        if not wake.is_set():
+            loop.call_soon_threadsafe(wake.set)
     
     def on_event(self, event: Event) -> None:
         """Handle conversation events and put them into the queue"""
-        logger.debug(f"QueueVisualizer.on_event called for event type: {type(event).__name__}")
-        
         if self.event_queue is None:
             logger.warning("QueueVisualizer.on_event called but event_queue is None")
             return
@@ -108,7 +304,9 @@ class QueueVisualizer(ConversationVisualizerBase):
             # Get basic event information
             event_type = type(event).__name__
             content = event.visualize
-            text_content = content.plain if content and hasattr(content, 'plain') else str(event)
+            # Fall back to the type name: str(event) would materialize any
+            # embedded screenshot data URL in full
+            text_content = content.plain if content and hasattr(content, 'plain') else event_type
             
             # Build SSE data with common fields
             sse_data = {
@@ -117,85 +315,38 @@ class QueueVisualizer(ConversationVisualizerBase):
                 "timestamp": getattr(event, 'timestamp', None),
             }
             
-            # Handle different event types using isinstance for clarity
-            # Note: ActionEvent, ObservationEvent, MessageEvent, SystemPromptEvent, etc. 
-            # all inherit from LLMConvertibleEvent
-            # We use separate checks for specific event types to add their unique fields
+            # Add the fields specific to this event type. The extractor for each
+            # event class is resolved once and cached, so the hot path is a single
+            # dict lookup instead of an isinstance/hasattr ladder per event.
+            extractor = _EVENT_EXTRACTORS.get(type(event)) or _build_event_extractor(type(event))
+            sse_data.update(extractor(event))
             
-            # Process specific event types (mutually exclusive)
-            if isinstance(event, ActionEvent):
-                # ActionEvent has action attribute
-                if event.action:
-                    sse_data["action"] = str(event.action)
-                if event.summary:
-                    sse_data["summary"] = str(event.summary)
-            
-            elif isinstance(event, ObservationEvent):
-                # ObservationEvent has observation attribute with possible image content
-                obs = event.observation
-                # Extract observation properties (same as original hasattr checks)
-                if hasattr(obs, 'success'):
-                    sse_data["success"] = obs.success
-                if hasattr(obs, 'message'):
-                    sse_data["message"] = obs.message
-                if hasattr(obs, 'error'):
-                    sse_data["error"] = obs.error
-                
-                # Check for image content in observations (especially for open_browser tool)
-                if hasattr(obs, 'screenshot_data_url') and obs.screenshot_data_url:
-                    sse_data["image"] = obs.screenshot_data_url
-                elif hasattr(obs, 'image_url') and obs.image_url:
-                    sse_data["image"] = obs.image_url
-                elif hasattr(obs, 'image') and obs.image:
-                    sse_data["image"] = obs.image
-            
-            elif isinstance(event, MessageEvent):
-                # MessageEvent has llm_message with role information
-                sse_data["role"] = event.llm_message.role
-                # Also include activated_skills if present
-                if event.activated_skills:
-                    sse_data["activated_skills"] = event.activated_skills
-                if event.sender:
-                    sse_data["sender"] = event.sender
-
-            # We could add more elif branches for other specific event types here:
-            # elif isinstance(event, SystemPromptEvent):
-            #     # Handle SystemPromptEvent specific fields
-
-            # For any LLMConvertibleEvent, extract image content from to_llm_content
-            # This is NOT mutually exclusive with the specific type checks above because:
-            # - ActionEvent, ObservationEvent, MessageEvent, etc. are all LLMConvertibleEvent
-            # - This check runs for ALL LLMConvertibleEvent types
-            # - The 'image' not in sse_data check prevents duplicate image extraction
-            #   (e.g., if ObservationEvent already found an image in observation.screenshot_data_url)
-            # This preserves the original logic where image extraction was a separate step
-            # that could potentially find images in any LLMConvertibleEvent
-            # if isinstance(event, LLMConvertibleEvent) and 'image' not in sse_data:
-            #     try:
-            #         llm_content = event.to_llm_content()
-            #         image_urls = []
-            #         for content in llm_content:
-            #             if isinstance(content, ImageContent):
-            #                 image_urls.extend(content.image_urls)
-            #         if image_urls:
-            #             sse_data["image"] = image_urls[0]  # Take first image
-            #             logger.debug(f"Added imgae for {event}")
-            #     except Exception as e:
-            #         logger.debug(f"Error extracting image content from {event_type}: {e}")
+            # Binary consumers get the screenshot as raw bytes straight from the
+            # observation instead of the base64 data URL
+            if self.binary_images and "image" in sse_data:
+                screenshot_bytes = getattr(getattr(event, "observation", None), "screenshot_bytes", None)
+                if screenshot_bytes is not None:
+                    sse_data["image"] = screenshot_bytes
+                    sse_data["image_mime"] = event.observation.screenshot_mime
+
+            # Other specific event types (e.g. SystemPromptEvent) can get their
+            # own extractor in _build_event_extractor. Images come from the
+            # observation extractor, so to_llm_content() is never walked here.
+
             # Put event in queue
             sse_event = SSEEvent("agent_event", sse_data)
-            self.event_queue.put(sse_event)
-            logger.debug(f"Queued SSE event: {sse_event.event_type} - type: {event_type}")
+            self.put_event(sse_event)
+            logger.debug("Queued SSE event: %s - type: %s", sse_event.event_type, event_type)
             
         except Exception as e:
-            logger.error(f"Error processing event in QueueVisualizer: {e}")
+            logger.error("Error processing event in QueueVisualizer: %s", e)
             # Put error event in queue
             error_event = SSEEvent("error", {
                 "type": "error",
                 "message": f"Error processing event: {str(e)}"
             })
             try:
-                self.event_queue.put(error_event)
+                self.put_event(error_event)
             except:
                 pass
 
@@ -209,13 +360,103 @@ class ConversationState:
     conversation: Conversation
     visualizer: QueueVisualizer
     created_at: float = field(default_factory=time.time)
+    # Blocking callable that runs the conversation, specialized once for a
+    # sync or coroutine `run` (see _make_run_dispatcher)
+    run_dispatcher: Callable[[], None] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.run_dispatcher = _make_run_dispatcher(self.conversation)
+
+
+@functools.cache
+def _agent_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop (on its own daemon thread) for coroutine `run` methods
+    
+    Started on first use and shared by all conversations, instead of setting
+    up an event loop per worker thread. Uses uvloop when available, like
+    the server loop under uvicorn.
+    """
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
+    return loop
+
+
+def _run_coroutine_on_agent_loop(run_method: Callable[[], Any]) -> None:
+    """Run a coroutine `run` method on the shared agent loop and wait for it"""
+    asyncio.run_coroutine_threadsafe(run_method(), _agent_loop()).result()
+
+
+def _make_run_dispatcher(conversation: Conversation) -> Callable[[], None]:
+    """Pick how to run a conversation once, instead of on every message"""
+    run_method = conversation.run
+    if inspect.iscoroutinefunction(run_method):
+        return functools.partial(_run_coroutine_on_agent_loop, run_method)
+    return run_method
+
+
+# Worker threads for running conversations. Each one is held for a whole
+# agent run, so they get their own pool rather than filling the loop's
+# default executor, which stays free for short blocking calls (setup).
+CONVERSATION_WORKERS = 32
+_conversation_executor: Optional[ThreadPoolExecutor] = None
+_conversation_executor_lock = threading.Lock()
+
+
+def _get_conversation_executor() -> ThreadPoolExecutor:
+    """Get the conversation worker pool, creating it on first use"""
+    global _conversation_executor
+    executor = _conversation_executor
+    if executor is None:
+        with _conversation_executor_lock:
+            if _conversation_executor is None:
+                _conversation_executor = ThreadPoolExecutor(
+                    max_workers=CONVERSATION_WORKERS,
+                    thread_name_prefix="conversation",
+                )
+            executor = _conversation_executor
+    return executor
+
+
+def shutdown_conversation_executor() -> None:
+    """Shut down the conversation worker pool (called on server shutdown)
+    
+    Queued runs are cancelled; running ones are not waited for, since an
+    agent run can take minutes.
+    """
+    global _conversation_executor
+    with _conversation_executor_lock:
+        executor, _conversation_executor = _conversation_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Reservation:
+    """Placeholder held in OpenBrowserAgentManager.conversations while a
+    conversation is being built, so check-and-insert is one dict operation"""
+    __slots__ = ("done",)
+    
+    def __init__(self):
+        # Set once the conversation is stored or its creation has failed
+        self.done = threading.Event()
 
 
 class OpenBrowserAgentManager:
     """Manages agent instances and conversations"""
     
     def __init__(self):
-        self.conversations: Dict[str, ConversationState] = {}
+        # Values are _Reservation while a conversation is being created
+        self.conversations: Dict[str, Union[ConversationState, _Reservation]] = {}
+        
+        # Struct-of-arrays copy of the fields list_conversations reports, so
+        # listing never touches the ConversationState/agent objects.
+        # _conversation_rows maps conversation ID -> row in the arrays.
+        # Creates run on worker threads and deletes on the server loop, so
+        # every multi-step change to conversations or the arrays holds _lock.
+        self._conversation_ids: List[str] = []
+        self._conversation_created_at: List[float] = []
+        self._conversation_agent_ids: List[int] = []
+        self._conversation_rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
         
         # Lazy initialization of LLM (only when needed)
         self._llm: Optional[LLM] = None
@@ -250,7 +491,7 @@ class OpenBrowserAgentManager:
                 "Or use the API: POST /api/config/llm with {'api_key': 'your-key'}"
             )
         
-        logger.info(f"Loading LLM configuration: model={llm_config.model}, base_url={llm_config.base_url}")
+        logger.info("Loading LLM configuration: model=%s, base_url=%s", llm_config.model, llm_config.base_url)
         
         return LLM(
             usage_id="openbrowser-agent",
@@ -269,40 +510,66 @@ class OpenBrowserAgentManager:
         if conversation_id is None:
             conversation_id = str(uuid.uuid4())
         
-        if conversation_id in self.conversations:
+        # Reserve the ID atomically (setdefault) instead of check-then-insert
+        reservation = _Reservation()
+        if self.conversations.setdefault(conversation_id, reservation) is not reservation:
             raise ValueError(f"Conversation {conversation_id} already exists")
         
-        # Create agent with tools
-        agent_context = AgentContext(current_datetime=datetime.now())
-        agent = Agent(
-            llm=self.llm,
-            tools=self.default_tools,
-            condenser=get_default_condenser(llm=self.llm.model_copy(update={"usage_id": "condenser"})),
-            agent_context=agent_context,
-        )
+        try:
+            # Create agent with tools
+            agent_context = AgentContext(current_datetime=datetime.now())
+            agent = Agent(
+                llm=self.llm,
+                tools=self.default_tools,
+                condenser=get_default_condenser(llm=self.llm.model_copy(update={"usage_id": "condenser"})),
+                agent_context=agent_context,
+            )
 
-        # Create visualizer (queue will be set when processing messages)
-        visualizer = QueueVisualizer()
-        
-        # Create conversation with specified workspace
-        conversation = Conversation(
-            agent=agent,
-            visualizer=visualizer,
-            workspace=cwd,
-        )
+            # Create visualizer (queue will be set when processing messages)
+            visualizer = QueueVisualizer()
+            
+            # Create conversation with specified workspace
+            conversation = Conversation(
+                agent=agent,
+                visualizer=visualizer,
+                workspace=cwd,
+            )
+        except BaseException:
+            # Release the reservation (waiting callers then retry)
+            self._release_reservation(conversation_id, reservation)
+            raise
         
-        # Store conversation state
-        self.conversations[conversation_id] = ConversationState(
+        # Store conversation state (replaces the reservation)
+        self._store_conversation(ConversationState(
             conversation_id=conversation_id,
             conversation=conversation,
             visualizer=visualizer,
-        )
+        ))
+        reservation.done.set()
         
         return conversation_id
     
+    def _release_reservation(self, conversation_id: str, reservation: _Reservation) -> None:
+        """Remove a reservation whose conversation could not be created"""
+        with self._lock:
+            if self.conversations.get(conversation_id) is reservation:
+                del self.conversations[conversation_id]
+        reservation.done.set()
+    
+    def _store_conversation(self, conv_state: ConversationState) -> None:
+        """Store conversation state and append its row to the listing arrays"""
+        conversation_id = conv_state.conversation_id
+        with self._lock:
+            self.conversations[conversation_id] = conv_state
+            self._conversation_rows[conversation_id] = len(self._conversation_ids)
+            self._conversation_ids.append(conversation_id)
+            self._conversation_created_at.append(conv_state.created_at)
+            self._conversation_agent_ids.append(id(conv_state.conversation.agent))
+    
     def get_conversation(self, conversation_id: str) -> Optional[ConversationState]:
         """Get conversation by ID"""
-        return self.conversations.get(conversation_id)
+        conv_state = self.conversations.get(conversation_id)
+        return None if isinstance(conv_state, _Reservation) else conv_state
     
     def get_or_create_conversation(self, conversation_id: str, cwd: str = ".") -> ConversationState:
         """Get existing conversation or create a new one with the given ID
@@ -311,92 +578,89 @@ class OpenBrowserAgentManager:
             conversation_id: Conversation ID to get or create
             cwd: Working directory for the conversation (default: current directory)
         """
-        conv_state = self.get_conversation(conversation_id)
-        if conv_state:
+        # Conversation doesn't exist: reserve the ID atomically (setdefault).
+        # If another thread holds the reservation, wait for it and look
+        # again: its creation may have failed, leaving the ID free.
+        reservation = _Reservation()
+        conv_state = self.conversations.setdefault(conversation_id, reservation)
+        while isinstance(conv_state, _Reservation) and conv_state is not reservation:
+            conv_state.done.wait()
+            with self._lock:
+                # A finished reservation still in place is stale (nothing
+                # owns it), so swap ours in rather than waiting on it again
+                if self.conversations.get(conversation_id) is conv_state:
+                    self.conversations[conversation_id] = reservation
+            conv_state = self.conversations.setdefault(conversation_id, reservation)
+        if conv_state is not reservation:
             return conv_state
         
-        # Conversation doesn't exist, create it
-        if conversation_id in self.conversations:
-            # Race condition: conversation was just created by another thread
-            return self.conversations[conversation_id]
-        
         # Create new conversation with the given ID
-        # Create agent with tools
-        agent_context = AgentContext(current_datetime=datetime.now())
-        agent = Agent(llm=self.llm, tools=self.default_tools, agent_context=agent_context)
-        
-        # Create visualizer (queue will be set when processing messages)
-        visualizer = QueueVisualizer()
-        
-        # Create conversation with specified workspace
-        conversation = Conversation(
-            agent=agent,
-            visualizer=visualizer,
-            workspace=cwd,
-        )
+        try:
+            # Create agent with tools
+            agent_context = AgentContext(current_datetime=datetime.now())
+            agent = Agent(llm=self.llm, tools=self.default_tools, agent_context=agent_context)
+            
+            # Create visualizer (queue will be set when processing messages)
+            visualizer = QueueVisualizer()
+            
+            # Create conversation with specified workspace
+            conversation = Conversation(
+                agent=agent,
+                visualizer=visualizer,
+                workspace=cwd,
+            )
+        except BaseException:
+            # Release the reservation (waiting callers then retry)
+            self._release_reservation(conversation_id, reservation)
+            raise
         
         # Store conversation state
-        self.conversations[conversation_id] = ConversationState(
+        self._store_conversation(ConversationState(
             conversation_id=conversation_id,
             conversation=conversation,
             visualizer=visualizer,
-        )
+        ))
+        reservation.done.set()
         
-        logger.debug(f"Created new conversation with ID: {conversation_id}")
+        logger.debug("Created new conversation with ID: %s", conversation_id)
         return self.conversations[conversation_id]
     
     def delete_conversation(self, conversation_id: str) -> bool:
         """Delete a conversation"""
-        if conversation_id in self.conversations:
-            del self.conversations[conversation_id]
-            return True
+        with self._lock:
+            conv_state = self.conversations.get(conversation_id)
+            # A reservation is left to the thread creating the conversation
+            if conv_state is not None and not isinstance(conv_state, _Reservation):
+                del self.conversations[conversation_id]
+                # Swap-remove the row so the listing arrays stay packed
+                row = self._conversation_rows.pop(conversation_id)
+                last = len(self._conversation_ids) - 1
+                if row != last:
+                    moved_id = self._conversation_ids[last]
+                    self._conversation_ids[row] = moved_id
+                    self._conversation_created_at[row] = self._conversation_created_at[last]
+                    self._conversation_agent_ids[row] = self._conversation_agent_ids[last]
+                    self._conversation_rows[moved_id] = row
+                self._conversation_ids.pop()
+                self._conversation_created_at.pop()
+                self._conversation_agent_ids.pop()
+                return True
         return False
     
     def list_conversations(self) -> List[Dict[str, Any]]:
         """List all conversations"""
-        return [
-            {
-                "id": conv.conversation_id,
-                "created_at": conv.created_at,
-                "agent_id": id(conv.conversation.agent),
-            }
-            for conv in self.conversations.values()
-        ]
-    
-    async def process_message(
-        self,
-        conversation_id: str,
-        message_text: str,
-        event_callback: callable = None
-    ) -> AsyncGenerator[SSEEvent, None]:
-        """Process a user message and stream events"""
-        conv_state = self.get_conversation(conversation_id)
-        if not conv_state:
-            raise ValueError(f"Conversation {conversation_id} not found")
-        
-        # Set event callback on visualizer
-        conv_state.visualizer.event_callback = event_callback
-        
-        try:
-            # Send user message
-            conv_state.conversation.send_message(message_text)
-            
-            # Run conversation (this will trigger visualizer callbacks)
-            await conv_state.conversation.run_async()
-            
-            # Yield completion event
-            yield SSEEvent("complete", {"conversation_id": conversation_id})
-            
-        except Exception as e:
-            logger.error(f"Error processing message: {e}")
-            yield SSEEvent("error", {
-                "conversation_id": conversation_id,
-                "error": str(e)
-            })
-        
-        finally:
-            # Clear callback
-            conv_state.visualizer.event_callback = None
+        with self._lock:
+            return [
+                {"id": conv_id, "created_at": created_at, "agent_id": agent_id}
+                for conv_id, created_at, agent_id in zip(
+                    self._conversation_ids,
+                    self._conversation_created_at,
+                    self._conversation_agent_ids,
+                    # The arrays always grow and shrink together; a mismatch
+                    # is a bug and should fail loudly
+                    strict=True,
+                )
+            ]
 
 
 # Global agent manager instance
@@ -412,201 +676,187 @@ async def create_agent_conversation(conversation_id: Optional[str] = None, cwd:
         conversation_id: Optional conversation ID (auto-generated if None)
         cwd: Working directory for the conversation (default: current directory)
     """
-    return agent_manager.create_conversation(conversation_id, cwd)
+    # Building the Agent/Conversation sets up the workspace and persistence
+    # on disk, so keep it off the event loop
+    return await asyncio.to_thread(agent_manager.create_conversation, conversation_id, cwd)
 
 
 async def process_agent_message(
     conversation_id: str,
     message_text: str,
-    cwd: str = "."
-) -> AsyncGenerator[str, None]:
+    cwd: str = ".",
+    use_msgpack: bool = False
+) -> AsyncGenerator[bytes, None]:
     """Process a message and yield SSE events using thread-based execution
     
     Args:
         conversation_id: Conversation ID to process message in
         message_text: Message text to send to agent
         cwd: Working directory for the conversation if creating new (default: current directory)
+        use_msgpack: Yield length-prefixed MessagePack frames instead of SSE text
     """
-    logger.debug(f"DEBUG: process_agent_message called with conversation_id={conversation_id}, message='{message_text[:50]}...', cwd={cwd}")
-    logger.info(f"Processing agent message for conversation {conversation_id}: '{message_text[:50]}...'")
-    logger.debug(f"Processing agent message for conversation {conversation_id}: '{message_text[:50]}...'")
+    encode = SSEEvent.to_msgpack_frame if use_msgpack else SSEEvent.to_sse_format
+
+    logger.info("Processing agent message for conversation %s: '%s...'", conversation_id, message_text[:50])
     
-    conv_state = agent_manager.get_or_create_conversation(conversation_id, cwd)
-    logger.debug(f"DEBUG: Using conversation {conversation_id} (created if new)")
+    # May build a new conversation (blocking setup), so run it off the loop
+    conv_state = await asyncio.to_thread(agent_manager.get_or_create_conversation, conversation_id, cwd)
     
-    # Create a queue for collecting events from visualizer
-    event_queue = queue.Queue()
+    # Create the SPSC handoff for collecting events from visualizer; the
+    # visualizer drops the oldest events if the client falls behind
+    loop = asyncio.get_running_loop()
+    event_queue: Deque[SSEEvent] = deque()
+    events_ready = asyncio.Event()
     
     # Set the event queue on the visualizer
-    conv_state.visualizer.set_event_queue(event_queue)
-    logger.debug(f"Event queue set on visualizer for conversation {conversation_id}")
+    visualizer = conv_state.visualizer
+    visualizer.set_event_queue(event_queue, events_ready, loop, binary_images=use_msgpack)
     
-    # Flag to track if conversation thread has finished
-    conversation_finished = False
+    # Set (on the loop) once the conversation thread has finished
+    producer_done = asyncio.Event()
     conversation_error = None
     
     def run_conversation():
-        """Run the conversation in a separate thread (synchronous)"""
-        nonlocal conversation_finished, conversation_error
+        """Run the conversation on a worker thread (synchronous)"""
+        nonlocal conversation_error
         try:
-            logger.debug(f"DEBUG: run_conversation starting for {conversation_id}")
-            logger.debug(f"Starting conversation execution in thread for {conversation_id}")
-            
-            # Set up event loop for this thread
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-                logger.debug(f"DEBUG: Using existing event loop in thread")
-            except RuntimeError:
-                logger.debug(f"DEBUG: Creating new event loop for thread")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+            logger.debug("Starting conversation execution in worker thread for %s", conversation_id)
             
             # Send user message to conversation
-            logger.debug(f"DEBUG: Sending message to conversation")
             conv_state.conversation.send_message(message_text)
             
-            # Run the conversation (check if it's async or sync)
-            import inspect
-            run_method = conv_state.conversation.run
-            
-            if inspect.iscoroutinefunction(run_method):
-                logger.debug(f"DEBUG: conversation.run() is async, running in thread event loop")
-                try:
-                    logger.debug(f"DEBUG: Running async conversation.run()")
-                    loop.run_until_complete(run_method())
-                    logger.debug(f"DEBUG: Async conversation.run() completed successfully")
-                finally:
-                    pass  # Don't close the loop - tools might still need it
-            else:
-                logger.debug(f"DEBUG: conversation.run() is sync, calling directly")
-                run_method()
-                logger.debug(f"DEBUG: Sync conversation.run() completed successfully")
-            logger.debug(f"Conversation {conversation_id} execution completed")
-            logger.debug(f"DEBUG: Putting complete event into queue")
+            # Run the conversation (sync or coroutine, decided at creation)
+            conv_state.run_dispatcher()
+            logger.debug("Conversation %s execution completed", conversation_id)
             # Put completion event in queue
-            event_queue.put(SSEEvent("complete", {
+            visualizer.put_event(SSEEvent("complete", {
                 "conversation_id": conversation_id,
                 "message": "Conversation completed"
             }))
-            logger.debug(f"DEBUG: Complete event put into queue")
             
         except Exception as e:
-            logger.debug(f"DEBUG: Exception in run_conversation: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            logger.error(f"Error running conversation in thread: {e}")
+            logger.exception("Error running conversation in thread")
             conversation_error = e
             # Put error event in queue
-            event_queue.put(SSEEvent("error", {
+            visualizer.put_event(SSEEvent("error", {
                 "conversation_id": conversation_id,
                 "error": str(e)
             }))
         finally:
-            logger.debug(f"DEBUG: run_conversation finally block, setting conversation_finished=True")
-            conversation_finished = True
-            logger.debug(f"DEBUG: conversation_finished set to True in thread")
+            # Scheduled after the final event so the consumer sees it first
+            loop.call_soon_threadsafe(producer_done.set)
             conv_state.conversation.close()
-            logger.debug(f"DEBUG: closed conversation")
     
-    # Start conversation thread
-    conversation_thread = threading.Thread(target=run_conversation, daemon=True)
-    conversation_thread.start()
-    logger.debug(f"Started conversation thread for {conversation_id}")
+    # Run the conversation on the dedicated conversation pool rather than a
+    # fresh thread per request. It can't run on the server loop itself: the
+    # browser tool makes blocking calls back into this server.
+    conversation_task = loop.run_in_executor(_get_conversation_executor(), run_conversation)
+    logger.debug("Started conversation task for %s", conversation_id)
     
     try:
-        # Yield events as they arrive from the queue
+        # Yield events as they arrive from the queue. Each idle period is a
+        # single wait on "new events" vs "producer finished", bounded by the
+        # idle timeout.
         timeout_seconds = 600.0  # Timeout for idle time (no events for 10 minutes)
-        last_event_time = time.time()
+        # Idle deadline on the loop's monotonic clock, pushed back whenever
+        # events are sent
+        idle_deadline = loop.time() + timeout_seconds
+        reported_drops = 0
+        producer_done_task = asyncio.ensure_future(producer_done.wait())
         
-        while True:
-            # Debug: print queue size
-            logger.debug(f"DEBUG: Queue size: {event_queue.qsize()}, conversation_finished: {conversation_finished}")
-            
-            # Check if conversation thread has finished
-            if conversation_finished and event_queue.empty():
-                logger.debug(f"Conversation thread finished and queue empty for {conversation_id}")
-                logger.debug(f"DEBUG: Conversation finished and queue empty, breaking loop")
-                break
-            
-            # Check for idle timeout (no events received for timeout_seconds)
-            idle_time = time.time() - last_event_time
-            if idle_time > timeout_seconds:
-                logger.warning(f"Timeout waiting for events from conversation {conversation_id} (idle for {idle_time:.1f}s)")
-                yield SSEEvent("error", {
-                    "conversation_id": conversation_id,
-                    "error": "Timeout waiting for agent response"
-                }).to_sse_format()
-                break
-            
-            try:
-                # Use asyncio to wait for queue item without blocking event loop
-                loop = asyncio.get_event_loop()
-                try:
-                    # Wait for event with timeout based on remaining idle time
-                    # Calculate remaining time before idle timeout
-                    remaining_time = max(10.0, timeout_seconds - idle_time)  # Minimum 10 seconds to reduce log noise
-                    logger.debug(f"DEBUG: Waiting for event from queue (timeout: {remaining_time:.1f}s, idle: {idle_time:.1f}s)...")
-                    sse_event = await loop.run_in_executor(
-                        None, event_queue.get, remaining_time
-                    )
-                    # Reset idle timer when we get an event
-                    last_event_time = time.time()
-                    logger.debug(f"DEBUG: Got SSE event from queue: {sse_event.event_type}")
-                except queue.Empty:
-                    # Continue loop to check other conditions
-                    logger.debug(f"DEBUG: Queue empty after waiting, checking conversation_finished: {conversation_finished}")
-                    continue
-                
-                # Check if this is a completion or error event
-                if sse_event.event_type in ["complete", "error"]:
-                    logger.debug(f"Yielding {sse_event.event_type} event for conversation {conversation_id}")
-                    logger.debug(f"DEBUG: Yielding {sse_event.event_type} event")
-                    yield sse_event.to_sse_format()
+        try:
+            finished = False
+            while not finished:
+                # Take everything queued so far and send it as one chunk
+                frames = []
+                while event_queue:
+                    sse_event = event_queue.popleft()
                     
-                    # If it's an error from the conversation thread, we should break
-                    if sse_event.event_type == "error":
-                        break
+                    # Tell the client how many events were dropped while it lagged
+                    if visualizer.dropped_events > reported_drops:
+                        frames.append(encode(SSEEvent("backpressure", {
+                            "conversation_id": conversation_id,
+                            "dropped": visualizer.dropped_events - reported_drops
+                        })))
+                        reported_drops = visualizer.dropped_events
                     
-                    # For completion events, drain remaining events from queue
-                    logger.debug(f"DEBUG: Draining remaining events from queue...")
-                    drained_count = 0
-                    while True:
-                        try:
-                            next_event = event_queue.get_nowait()
-                            logger.debug(f"DEBUG: Draining event #{drained_count + 1}: {next_event.event_type}")
-                            yield next_event.to_sse_format()
-                            drained_count += 1
-                        except queue.Empty:
-                            logger.debug(f"DEBUG: Queue empty after draining {drained_count} events")
+                    # Check if this is a completion or error event
+                    if sse_event.event_type in ["complete", "error"]:
+                        logger.debug("Yielding %s event for conversation %s", sse_event.event_type, conversation_id)
+                        frames.append(encode(sse_event))
+                        
+                        # If it's an error from the conversation thread, we should break
+                        if sse_event.event_type == "error":
+                            finished = True
                             break
+                        
+                        # For completion events, drain remaining events from queue
+                        while event_queue:
+                            frames.append(encode(event_queue.popleft()))
+                        finished = True
+                        break
                     
-                    break
-                else:
                     # Yield regular event
-                    logger.debug(f"Yielding SSE event for conversation {conversation_id}: {sse_event.event_type}")
-                    logger.debug(f"DEBUG: Yielding regular SSE event: {sse_event.event_type}")
-                    sse_format = sse_event.to_sse_format()
-                    logger.debug(f"DEBUG: SSE format string (first 500 chars): {sse_format[:500]}")
-                    yield sse_format
-                    
-            except Exception as e:
-                logger.error(f"Error processing events from queue: {e}")
-                yield SSEEvent("error", {
-                    "conversation_id": conversation_id,
-                    "error": f"Error processing events: {str(e)}"
-                }).to_sse_format()
-                break
+                    sse_format = encode(sse_event)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("SSE frame for conversation %s (first 500 chars): %s", conversation_id, sse_format[:500])
+                    frames.append(sse_format)
+                
+                if frames:
+                    yield b"".join(frames)
+                    idle_deadline = loop.time() + timeout_seconds
+                
+                if finished:
+                    break
+                
+                # Clear before re-checking so an append racing with us is not missed
+                events_ready.clear()
+                if event_queue:
+                    continue
+                
+                if producer_done.is_set():
+                    # Conversation thread finished and everything was yielded
+                    logger.debug("Conversation thread finished for %s, queue drained", conversation_id)
+                    break
+                
+                remaining = idle_deadline - loop.time()
+                done = None
+                if remaining > 0:
+                    wake_task = asyncio.ensure_future(events_ready.wait())
+                    done, _ = await asyncio.wait(
+                        {wake_task, producer_done_task},
+                        timeout=remaining,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if wake_task not in done:
+                        wake_task.cancel()
+                if not done:
+                    # No events received for timeout_seconds
+                    logger.warning("Timeout waiting for events from conversation %s (idle for %.1fs)", conversation_id, timeout_seconds)
+                    yield encode(SSEEvent("error", {
+                        "conversation_id": conversation_id,
+                        "error": "Timeout waiting for agent response"
+                    }))
+                    break
+                
+        except Exception as e:
+            logger.error("Error processing events from queue: %s", e)
+            yield encode(SSEEvent("error", {
+                "conversation_id": conversation_id,
+                "error": f"Error processing events: {str(e)}"
+            }))
+        finally:
+            producer_done_task.cancel()
         
-        # Wait for thread to finish (with timeout)
-        await asyncio.get_event_loop().run_in_executor(None, conversation_thread.join, 5.0)
-        if conversation_thread.is_alive():
-            logger.warning(f"Conversation thread for {conversation_id} still alive after join timeout")
+        # Wait for the conversation to finish (with timeout)
+        done, _ = await asyncio.wait({conversation_task}, timeout=5.0)
+        if conversation_task not in done:
+            logger.warning("Conversation task for %s still running after join timeout", conversation_id)
             
     finally:
         # Clear the event queue from visualizer
-        conv_state.visualizer.set_event_queue(None)
-        logger.debug(f"Cleaned up visualizer event queue for conversation {conversation_id}")
+        visualizer.set_event_queue(None)
+        logger.debug("Cleaned up visualizer event queue for conversation %s", conversation_id)
 
 
 async def get_conversation_info(conversation_id: str) -> Optional[Dict[str, Any]]:
@@ -633,8 +883,9 @@ async def list_conversations() -> List[Dict[str, Any]]:
 
 # --- Initialization ---
 
+@functools.cache
 def initialize_agent():
-    """Initialize the agent system"""
+    """Initialize the agent system (idempotent; called from the app's startup hook)"""
     logger.info("Initializing OpenBrowserAgent...")
     
     # Check if browser server is available
@@ -642,17 +893,13 @@ def initialize_agent():
         from server.core.processor import command_processor
         logger.info("Browser command processor available")
     except ImportError as e:
-        logger.warning(f"Browser command processor not available: {e}")
+        logger.warning("Browser command processor not available: %s", e)
     
     # Register tools if not already registered
     try:
         from .tools.open_browser_tool import OpenBrowserTool
         logger.info("OpenBrowserTool registered")
     except Exception as e:
-        logger.error(f"Failed to register OpenBrowserTool: {e}")
+        logger.error("Failed to register OpenBrowserTool: %s", e)
     
     logger.info("OpenBrowserAgent initialized")
-
-
-# Initialize on module import
-initialize_agent()
\ No newline at end of file
@@ -7,29 +7,112 @@ textual information (current tab list, mouse position) and a screenshot
 image for visual feedback.
 """
 
-import time
+import io
+import json
 import logging
+import socket
 import threading
-import requests
-from typing import Optional, List, Dict, Any, Literal, Union
+import weakref
+import atexit
+import httpx
+import orjson
+from typing import Optional, List, Dict, Any, Final, Literal, Tuple, Union
 from enum import Enum
+from functools import cached_property, lru_cache
 from collections.abc import Sequence
+try:
+    # SIMD base64 decoder for screenshot payloads, when installed
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    # Decodes straight from a buffer (base64.b64decode would copy it first)
+    from binascii import a2b_base64 as _b64decode
 
 from pydantic import Field, SecretStr
 from openhands.sdk import Action, Observation, ImageContent, TextContent
 from openhands.sdk.tool import ToolExecutor, ToolDefinition, register_tool
 
-logger = logging.getLogger(__name__)
-
 from server.core.processor import command_processor
 from server.models.commands import (
-    ScreenshotCommand,
-    TabCommand, GetTabsCommand, JavascriptExecuteCommand,
-    TabAction
+    TabCommand, JavascriptExecuteCommand,
+    TabAction, ObservationOptions
 )
 
 logger = logging.getLogger(__name__)
 
+# Pooled keep-alive client for the local server's HTTP command API, shared by
+# all executors. Created on first use and closed on server shutdown.
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+# Seconds to wait for a command (including its post-action observation)
+_COMMAND_TIMEOUT = 30
+_JSON_HEADERS = {"content-type": "application/json"}
+# Concurrent in-flight commands (one per running conversation at most)
+_HTTP_MAX_CONNECTIONS = 32
+_HTTP_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+def _get_http_client() -> httpx.Client:
+    """Get the shared HTTP client, creating it on first use"""
+    global _http_client
+    client = _http_client
+    if client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                # Small JSON commands on a reused connection: disable Nagle so
+                # they are not held back waiting for an ACK. Every connection
+                # may stay alive, so concurrent commands each keep their own
+                # instead of reconnecting after a burst
+                transport = httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=_HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=30,
+                    ),
+                    socket_options=_HTTP_SOCKET_OPTIONS,
+                )
+                _http_client = httpx.Client(
+                    base_url="http://127.0.0.1:8765",
+                    # Connecting to localhost is immediate when the server is
+                    # up, so fail fast instead of waiting out the command timeout
+                    timeout=httpx.Timeout(_COMMAND_TIMEOUT, connect=1.0),
+                    transport=transport,
+                    trust_env=False,  # Keep proxy settings away from localhost
+                )
+                # Connect in the background so the first action finds a
+                # live keep-alive connection instead of paying for the connect
+                threading.Thread(
+                    target=_warm_http_client,
+                    args=(_http_client,),
+                    name="open-browser-http-warmup",
+                    daemon=True,
+                ).start()
+            client = _http_client
+    return client
+
+
+def _warm_http_client(client: httpx.Client) -> None:
+    """Open a pooled connection with a cheap request (the API info endpoint)"""
+    try:
+        client.get("/api")
+    except Exception as e:
+        # Best effort: the first command will connect instead
+        logger.debug("HTTP client warm-up failed: %s", e)
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client (called on server shutdown)"""
+    global _http_client
+    with _http_client_lock:
+        client, _http_client = _http_client, None
+    if client is not None:
+        client.close()
+
+
+atexit.register(close_http_client)
+
 
 # --- Single Action Type ---
 
@@ -64,6 +147,152 @@ Supported action types and their parameters:
 
 # --- Observation ---
 
+def data_url_mime(data_url: str) -> Optional[str]:
+    """MIME type of a base64 data URL (data:<mime>;base64,...), or None if
+    the string is not one"""
+    comma = data_url.find(",")
+    # Only the short header is sliced, never the payload
+    header = data_url[:comma] if comma != -1 else ""
+    if not header.startswith("data:") or not header.endswith(";base64"):
+        return None
+    return header[5:-7]
+
+
+def decode_data_url(data_url: str) -> bytes:
+    """Decode the base64 payload of a data URL to raw bytes
+    
+    Decodes from a view past the comma instead of slicing the (screenshot
+    sized) payload out of the string first, saving one full copy.
+    """
+    payload = memoryview(data_url.encode("ascii"))[data_url.index(",") + 1:]
+    return _b64decode(payload)
+
+
+def _tabs_fingerprint(tabs: List[Dict[str, Any]]) -> tuple:
+    """Hashable key of the tab fields shown to the LLM"""
+    return tuple(
+        (tab['id'], bool(tab.get('active')), tab.get('title', 'No title')[:50], tab.get('url', 'No URL'))
+        for tab in tabs
+    )
+
+
+@lru_cache(maxsize=32)
+def _format_tabs_section(tabs_key: tuple) -> str:
+    """Format the Browser State section (memoized: the tab list rarely changes)"""
+    lines = ["## Browser State", "", f"**Open Tabs** ({len(tabs_key)}):", ""]
+    for i, (tab_id, active, title, url) in enumerate(tabs_key, 1):
+        active_marker = "●" if active else "○"
+        lines.append(f"{i}. {active_marker} **[{tab_id}]** {title}")
+        lines.append(f"   URL: {url}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+# JavaScript results shown to the LLM are cut at this many characters
+_JS_RESULT_LIMIT = 50000
+_JS_RESULT_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _dump_json_bounded(value: object, limit: int) -> Tuple[str, bool]:
+    """Pretty-print value as JSON, stopping once the text exceeds limit
+    
+    Returns (text, truncated). A large result (e.g. a DOM dump) is only
+    encoded up to the limit instead of in full and then sliced.
+    """
+    buf = io.StringIO()
+    size = 0
+    for chunk in _JS_RESULT_ENCODER.iterencode(value):
+        buf.write(chunk)
+        size += len(chunk)
+        if size > limit:
+            return buf.getvalue()[:limit], True
+    return buf.getvalue(), False
+
+
+def _render_observation_text(
+    success: bool,
+    message: Optional[str],
+    error: Optional[str],
+    javascript_result: object,
+    tabs: List[Dict[str, Any]],
+    mouse_position: Optional[Dict[str, int]],
+    screenshot_unchanged: bool,
+) -> str:
+    """Render the observation's LLM text section (used by _llm_text)
+    
+    Takes the observation's fields as typed plain values rather than the
+    model itself.
+    """
+    # Written line by line into one buffer (every line ends with "\n";
+    # the final newline is dropped at the end)
+    buf = io.StringIO()
+    write = buf.write
+    
+    # Operation Status Section
+    write("## Operation Status\n\n")
+    if not success:
+        write("**Status**: FAILED\n")
+        write(f"**Error**: {error}\n")
+    else:
+        write("**Status**: SUCCESS\n")
+        # For JavaScript operations, show minimal confirmation
+        if javascript_result is not None and message:
+            # Extract just "Executed JavaScript" without the script content
+            if "Executed JavaScript:" in message:
+                write("**Action**: JavaScript code executed successfully\n")
+            else:
+                write(f"**Action**: {message}\n")
+        elif message:
+            write(f"**Action**: {message}\n")
+    
+    write("\n")
+    
+    # JavaScript Result Section (if applicable)
+    if javascript_result is not None:
+        write("## Execution Result\n\n")
+        
+        # Format result based on type
+        fence, truncated_note = "```\n", "... (truncated)"
+        truncated = False
+        if isinstance(javascript_result, (dict, list)):
+            try:
+                # Pretty-print JSON with indentation
+                result_str, truncated = _dump_json_bounded(javascript_result, _JS_RESULT_LIMIT)
+                fence, truncated_note = "```json\n", "\n... (output truncated)"
+            except (TypeError, ValueError):
+                # Fallback to string representation
+                result_str = str(javascript_result)
+        else:
+            # For non-dict/list results (strings, numbers, etc.)
+            result_str = str(javascript_result)
+        
+        # Written in pieces: the (up to 50 KB) result is not copied again
+        # into a concatenated or f-string
+        write(fence)
+        if truncated or len(result_str) > _JS_RESULT_LIMIT:
+            write(result_str[:_JS_RESULT_LIMIT])
+            write(truncated_note)
+        else:
+            write(result_str)
+        write("\n```\n\n")
+    
+    # Browser State Section
+    if tabs:
+        write(_format_tabs_section(_tabs_fingerprint(tabs)))
+        write("\n")
+    
+    if mouse_position:
+        x = mouse_position['x']
+        y = mouse_position['y']
+        write(f"## Cursor Position\n\n**Coordinates**: ({x}, {y})\n")
+        write("**System**: Preset coordinate system (center: 0,0; right: +X; down: +Y)\n\n")
+    
+    if screenshot_unchanged:
+        write("🖼️ Screenshot unchanged since last action\n\n")
+    
+    return buf.getvalue()[:-1]
+
+
 class OpenBrowserObservation(Observation):
     """Observation returned by OpenBrowserTool after each action"""
     
@@ -77,307 +306,233 @@ class OpenBrowserObservation(Observation):
     )
     screenshot_data_url: Optional[str] = Field(
         default=None,
-        description="Screenshot as data URL (base64 encoded PNG, 1280x720 pixels)"
+        repr=False,  # Hundreds of KB: keep it out of reprs and log lines
+        description="Screenshot as data URL (base64 encoded WebP, 1280x720 pixels)"
     )
     javascript_result: Optional[Any] = Field(
         default=None,
         description="Result of JavaScript execution (if action was javascript_execute)"
     )
+    screenshot_unchanged: bool = Field(
+        default=False,
+        description="Screenshot was identical to the previous action's, so it is omitted"
+    )
+    
+    @cached_property
+    def screenshot_bytes(self) -> Optional[bytes]:
+        """Raw screenshot image bytes, decoded from screenshot_data_url once"""
+        if self.screenshot_mime is None:
+            return None
+        return decode_data_url(self.screenshot_data_url)
     
     @property
-    def to_llm_content(self) -> Sequence[TextContent | ImageContent]:
-        """Convert observation to LLM content format"""
-        import json
-        
-        content_items = []
-        text_parts = []
-        
-        # Operation Status Section
-        text_parts.append("## Operation Status")
-        text_parts.append("")
-        if not self.success:
-            text_parts.append(f"**Status**: FAILED")
-            text_parts.append(f"**Error**: {self.error}")
-        else:
-            text_parts.append(f"**Status**: SUCCESS")
-            # For JavaScript operations, show minimal confirmation
-            if self.javascript_result is not None and self.message:
-                # Extract just "Executed JavaScript" without the script content
-                if "Executed JavaScript:" in self.message:
-                    text_parts.append("**Action**: JavaScript code executed successfully")
-                else:
-                    text_parts.append(f"**Action**: {self.message}")
-            elif self.message:
-                text_parts.append(f"**Action**: {self.message}")
-        
-        text_parts.append("")
-        
-        # JavaScript Result Section (if applicable)
-        if self.javascript_result is not None:
-            text_parts.append("## Execution Result")
-            text_parts.append("")
-            
-            # Format result based on type
-            if isinstance(self.javascript_result, (dict, list)):
-                try:
-                    # Pretty-print JSON with indentation
-                    result_str = json.dumps(self.javascript_result, indent=2, ensure_ascii=False)
-                    if len(result_str) > 50000:
-                        result_str = result_str[:50000] + "\n... (output truncated)"
-                    text_parts.append("```json")
-                    text_parts.append(result_str)
-                    text_parts.append("```")
-                except (TypeError, ValueError):
-                    # Fallback to string representation
-                    result_str = str(self.javascript_result)
-                    if len(result_str) > 50000:
-                        result_str = result_str[:50000] + "... (truncated)"
-                    text_parts.append("```")
-                    text_parts.append(result_str)
-                    text_parts.append("```")
-            else:
-                # For non-dict/list results (strings, numbers, etc.)
-                result_str = str(self.javascript_result)
-                if len(result_str) > 50000:
-                    result_str = result_str[:50000] + "... (truncated)"
-                text_parts.append("```")
-                text_parts.append(result_str)
-                text_parts.append("```")
-            text_parts.append("")
-        
-        # Browser State Section
-        if self.tabs:
-            text_parts.append("## Browser State")
-            text_parts.append("")
-            text_parts.append(f"**Open Tabs** ({len(self.tabs)}):")
-            text_parts.append("")
-            for i, tab in enumerate(self.tabs, 1):
-                active_marker = "●" if tab.get('active') else "○"
-                title = tab.get('title', 'No title')[:50]
-                url = tab.get('url', 'No URL')
-                text_parts.append(f"{i}. {active_marker} **[{tab['id']}]** {title}")
-                text_parts.append(f"   URL: {url}")
-            text_parts.append("")
-        
-        if self.mouse_position:
-            text_parts.append("## Cursor Position")
-            text_parts.append("")
-            x = self.mouse_position['x']
-            y = self.mouse_position['y']
-            text_parts.append(f"**Coordinates**: ({x}, {y})")
-            text_parts.append(f"**System**: Preset coordinate system (center: 0,0; right: +X; down: +Y)")
-            text_parts.append("")
+    def screenshot_mime(self) -> Optional[str]:
+        """MIME type of the screenshot (e.g. "image/png")"""
+        data_url = self.screenshot_data_url
+        return data_url_mime(data_url) if data_url else None
+    
+    @cached_property
+    def _llm_text(self) -> str:
+        """Formatted text section shared by to_llm_content and visualize"""
+        return _render_observation_text(
+            self.success,
+            self.message,
+            self.error,
+            self.javascript_result,
+            self.tabs,
+            self.mouse_position,
+            self.screenshot_unchanged,
+        )
+    
+    @cached_property
+    def _llm_content(self) -> tuple:
+        """Content items built once per observation
         
-        text_content = "\n".join(text_parts)
-        content_items.append(TextContent(text=text_content))
+        The agent converts every observation in the history on each LLM step,
+        so the (screenshot-sized) ImageContent is created once and shared
+        instead of being rebuilt around the same data URL every time.
+        """
+        content_items = [TextContent(text=self._llm_text)]
         
         # Add image content if screenshot is available
         if self.screenshot_data_url:
             content_items.append(ImageContent(image_urls=[self.screenshot_data_url]))
         
-        return content_items
+        return tuple(content_items)
+    
+    @property
+    def to_llm_content(self) -> Sequence[TextContent | ImageContent]:
+        """Convert observation to LLM content format"""
+        return list(self._llm_content)
 
     @property
     def visualize(self):
         """Return Rich Text representation for visualization.
         
         This method is called by QueueVisualizer.on_event() to get text content
-        for SSE streaming. We extract only TextContent from to_llm_content and
-        ignore ImageContent, since images are extracted separately via the
-        screenshot_data_url field.
+        for SSE streaming. Only the (cached) text section is used; images are
+        extracted separately via the screenshot_data_url field, so no
+        ImageContent is built here.
         
         Returns:
             rich.text.Text: Rich Text object with formatted content
         """
         from rich.text import Text
         
-        # Get all content from to_llm_content
-        llm_content = self.to_llm_content
-        
-        # Extract only text content, ignore ImageContent
-        # (images are extracted separately via screenshot_data_url in agent.py)
-        text_parts = []
-        for item in llm_content:
-            if isinstance(item, TextContent):
-                text_parts.append(item.text)
-        
-        # Combine all text parts
-        full_text = "\n".join(text_parts) if text_parts else "[no content]"
-        
-        # Return as Rich Text object
-        return Text(full_text)
+        return Text(self._llm_text or "[no content]")
 
 
 # --- Executor ---
 
+# Image formats the extension can capture screenshots in
+ScreenshotFormat = Literal["png", "jpeg", "webp"]
+
+# Post-action state the server attaches to each command's response, so an
+# action costs one round trip instead of three (command, screenshot, tabs).
+# WebP at quality 80 is roughly a third smaller than JPEG at 90 for UI
+# screenshots, and several times smaller than PNG.
+_OBSERVE_SCREENSHOT = ObservationOptions(
+    # FIXME: temp method to let chrome render for 1 sec.
+    settle_delay=1.0,
+    screenshot_quality=80,
+    screenshot_format="webp",
+)
+
+
+@lru_cache(maxsize=None)
+def _observe_presets(screenshot_format: ScreenshotFormat) -> tuple:
+    """(screenshot, screenshot + tabs, read-only) options for an image format"""
+    # Validated rather than model_copy'd, so an unsupported format fails
+    # here instead of in the extension
+    screenshot = ObservationOptions.model_validate(
+        {**_OBSERVE_SCREENSHOT.model_dump(), "screenshot_format": screenshot_format}
+    )
+    return (
+        screenshot,
+        screenshot.model_copy(update={"tabs": True}),
+        # Read-only actions have nothing to render: no settle delay, and the
+        # capture runs alongside the command
+        screenshot.model_copy(update={"settle_delay": 0.0, "overlap": True}),
+    )
+
+# Read-only tab actions: the page is untouched, so once the agent has a
+# screenshot no new one is captured for them
+_NO_PIXEL_CHANGE_TAB_ACTIONS = frozenset((TabAction.LIST,))
+
+# A parameterless list with no observation is the same command every time
+_TAB_LIST_COMMAND = TabCommand(action=TabAction.LIST)
+
+# Tab action string -> TabAction, built once instead of per call
+_TAB_ACTIONS: Dict[str, TabAction] = {tab_action.value: tab_action for tab_action in TabAction}
+
+
+def _parse_tab_action(action_str: str) -> Optional[TabAction]:
+    """TabAction for an action string, or None if it names no tab action
+    
+    Exact matches are one dict lookup; other casings such as "LIST" or
+    "Open" only pay for a lower() on a miss.
+    """
+    return _TAB_ACTIONS.get(action_str) or _TAB_ACTIONS.get(action_str.lower())
+
+
+# Result message template per tab action (one lookup instead of an if/elif chain)
+_TAB_MESSAGES: Dict[TabAction, str] = {
+    TabAction.OPEN: "Opened tab with URL: {url}",
+    TabAction.INIT: "Initialized session with URL: {url}",
+    TabAction.CLOSE: "Closed tab ID: {tab_id}",
+    TabAction.SWITCH: "Switched to tab ID: {tab_id}",
+    TabAction.REFRESH: "Refreshed tab ID: {tab_id}",
+    TabAction.LIST: "Listed tabs",
+}
+
+
 class OpenBrowserExecutor(ToolExecutor[OpenBrowserAction, OpenBrowserObservation]):
     """Executor for browser automation commands"""
     
-    def __init__(self):
-        # We'll use the existing command_processor from the server
-        pass
+    def __init__(self, screenshot_format: ScreenshotFormat = "webp"):
+        # Post-action observation options; "png" gives pixel-exact screenshots
+        # (for debugging) at several times the size
+        (
+            self._observe_screenshot,
+            self._observe_screenshot_and_tabs,
+            self._observe_read_only,
+        ) = _observe_presets(screenshot_format)
+        # Last tab list seen by this executor (reused if a refresh fails)
+        self._last_tabs_data: List[Dict[str, Any]] = []
+        # imageHash of the last screenshot sent to the agent
+        self._last_screenshot_hash: Optional[str] = None
     
     def _execute_action_sync(self, action: OpenBrowserAction) -> OpenBrowserObservation:
         """Execute a browser action synchronously via HTTP"""
-        logger.debug(f"DEBUG: _execute_action_sync called with action_type={action.type}")
+        logger.debug("_execute_action_sync called with action_type=%s", action.type)
         try:
             # Get action type
             action_type = action.type
             
-            # Convert to appropriate server command based on type
-            result_dict = None
-            message = ""
-            javascript_result = None  # Store JavaScript execution result
-            
-            if action_type == "tab":
-                # Validate required parameters
-                if action.action is None:
-                    raise ValueError("tab requires action parameter")
-                action_str = action.action
-                # Convert action string to TabAction enum
-                # TabAction enum values are uppercase, so convert 'open' -> 'OPEN'
-                try:
-                    action_enum = TabAction(action_str.upper())
-                except ValueError:
-                    # If direct conversion fails, try to map common values
-                    action_map = {
-                        'init': TabAction.INIT,
-                        'open': TabAction.OPEN,
-                        'close': TabAction.CLOSE,
-                        'switch': TabAction.SWITCH,
-                        'list': TabAction.LIST,
-                        'refresh': TabAction.REFRESH
-                    }
-                    if action_str in action_map:
-                        action_enum = action_map[action_str]
-                    else:
-                        raise ValueError(f"Invalid tab action: {action_str}")
-                
-                command = TabCommand(
-                    action=action_enum,
-                    url=action.url,
-                    tab_id=action.tab_id
-                )
-                result_dict = self._execute_command_sync(command)
-                
-                if action_str == "open":
-                    message = f"Opened tab with URL: {action.url}"
-                elif action_str == "init":
-                    message = f"Initialized session with URL: {action.url}"
-                elif action_str == "close":
-                    message = f"Closed tab ID: {action.tab_id}"
-                elif action_str == "switch":
-                    message = f"Switched to tab ID: {action.tab_id}"
-                elif action_str == "refresh":
-                    message = f"Refreshed tab ID: {action.tab_id}"
-                elif action_str == "list":
-                    message = "Listed tabs"
-                else:
-                    message = f"Tab action: {action_str}"
-                    
-            elif action_type == "javascript_execute":
-                # Validate required parameters
-                if action.script is None:
-                    raise ValueError("javascript_execute requires script parameter")
-                command = JavascriptExecuteCommand(script=action.script)
-                result_dict = self._execute_command_sync(command)
-                
-                # Truncate long scripts for message
-                script = action.script
-                if len(script) > 50:
-                    message = f"Executed JavaScript: '{script[:50]}...'"
-                else:
-                    message = f"Executed JavaScript: '{script}'"
-                
-                # Extract JavaScript execution result for observation
-                if result_dict and result_dict.get('data'):
-                    js_data = result_dict['data']
-                    # JavaScript module returns result in 'result' field
-                    if isinstance(js_data, dict):
-                        if 'result' in js_data:
-                            js_result = js_data['result']
-                            # CDP result object has 'value' field when returnByValue is true
-                            if isinstance(js_result, dict) and 'value' in js_result:
-                                javascript_result = js_result['value']
-                            else:
-                                javascript_result = js_result
-                        # Also check for direct 'value' in data
-                        elif 'value' in js_data:
-                            javascript_result = js_data['value']
-                        else:
-                            # If no result or value, use the entire data dict
-                            javascript_result = js_data
-                    else:
-                        # If data is not a dict (e.g., string error), use it as result
-                        javascript_result = js_data
-                    
-                    # If we have a result, update message to include it (only for successful executions)
-                    if javascript_result is not None and result_dict.get('success'):
-                        result_str = str(javascript_result)
-                        if len(result_str) > 100:
-                            result_str = result_str[:100] + '...'
-                        message = f"{message} - Result: {result_str}"
-                elif result_dict and result_dict.get('error'):
-                    # If there's an error but no data, use error as javascript_result
-                    javascript_result = result_dict['error']
-                    
-            else:
+            # Dispatch to the handler for this action type
+            handler = self._ACTION_HANDLERS.get(action_type)
+            if handler is None:
                 raise ValueError(f"Unknown action type: {action_type}")
+            result_dict, message, javascript_result = handler(self, action)
+            
+            # Extract success from result_dict
+            success = False
+            error = None
+            if result_dict:
+                success = result_dict.get('success', False)
+                if 'error' in result_dict:
+                    error = result_dict['error']
+                elif 'message' in result_dict and 'error' in result_dict.get('data', {}):
+                    error = result_dict['data']['error']
             
             # Determine what data to collect based on action type
             tabs_data = []
             mouse_position = None
             screenshot_data_url = None
             
-            # 1. Always collect screenshot for visual feedback (but don't include in text)
-            logger.debug(f"DEBUG: Getting screenshot after action (sync)...")
-            # FIXME: temp method to let chrome render for 1 sec.
-            time.sleep(1)
-            screenshot_result = self._get_screenshot_sync()
-            logger.debug(f"DEBUG: screenshot_result: success={screenshot_result.get('success')}, data keys={list(screenshot_result.get('data', {}).keys()) if screenshot_result.get('data') else 'None'}")
+            # The server captured the post-action state (after the render
+            # wait) and returned it with the result, see _observe_presets
+            observation = (result_dict or {}).get('observation') or {}
+            screenshot_result = observation.get('screenshot') or {}
+            tabs_result = observation.get('tabs')
+            logger.debug(
+                "observation: screenshot success=%s, tabs success=%s",
+                screenshot_result.get('success'), tabs_result and tabs_result.get('success'),
+            )
             
-            if screenshot_result.get('success') and screenshot_result.get('data'):
-                # Try to extract image data
-                image_data = None
-                data = screenshot_result['data']
-                if 'imageData' in data:
-                    image_data = data['imageData']
-                elif 'image_data' in data:
-                    image_data = data['image_data']
-                
-                if image_data:
-                    # Ensure it's a data URL
-                    if isinstance(image_data, str) and image_data.startswith('data:image/'):
-                        screenshot_data_url = image_data
-                    elif isinstance(image_data, str):
-                        # Convert base64 to data URL
-                        screenshot_data_url = f"data:image/png;base64,{image_data}"
-                    else:
-                        logger.debug(f"DEBUG: Unexpected image_data type: {type(image_data)}")
+            # A 'list' already returned the managed tab list (so no separate
+            # tabs read was requested for it). Any casing the handler accepted
+            # counts, so compare the parsed enum rather than the raw string
+            if success and action_type == "tab" and _parse_tab_action(action.action) is TabAction.LIST:
+                listed_tabs = (result_dict.get('data') or {}).get('tabs')
+                tabs_data = self._last_tabs_data if listed_tabs is None else listed_tabs
+                self._last_tabs_data = tabs_data
             
-            # 2. Collect tabs data only for tab operations
-            if action_type == "tab":
-                logger.debug(f"DEBUG: Getting tabs after tab action (sync)...")
-                tabs_result = self._get_tabs_sync()
-                logger.debug(f"DEBUG: tabs_result: success={tabs_result.get('success')}, data keys={list(tabs_result.get('data', {}).keys()) if tabs_result.get('data') else 'None'}")
-                
+            # 1. Screenshot for visual feedback (but don't include in text).
+            # A capture identical to the previous one comes back without its
+            # image: the agent already has it, and it dominates each step's tokens
+            # A read-only action captured nothing: the last screenshot still applies
+            screenshot_unchanged = not observation and self._last_screenshot_hash is not None
+            screenshot_data = screenshot_result.get('data') if screenshot_result.get('success') else None
+            if screenshot_data:
+                if screenshot_data.get('unchanged'):
+                    screenshot_unchanged = True
+                else:
+                    # The extension always returns imageData as a complete data
+                    # URL (data:image/<format>;base64,...), so use it as-is
+                    screenshot_data_url = screenshot_data.get('imageData') or None
+                    if screenshot_data_url is not None:
+                        self._last_screenshot_hash = screenshot_data.get('imageHash')
+            
+            # 2. Tabs data (tab operations only; last known list if the refresh failed)
+            if tabs_result is not None:
                 if tabs_result.get('success') and tabs_result.get('data') and 'tabs' in tabs_result['data']:
-                    tabs_data = tabs_result['data']['tabs']
-            elif action_type == "javascript_execute":
-                pass
+                    tabs_data = self._last_tabs_data = tabs_result['data']['tabs']
+                else:
+                    tabs_data = self._last_tabs_data
             
             # 3. javascript_result is already set in javascript_execute branch
             
-            # Extract success from result_dict
-            success = False
-            error = None
-            if result_dict:
-                success = result_dict.get('success', False)
-                if 'error' in result_dict:
-                    error = result_dict['error']
-                elif 'message' in result_dict and 'error' in result_dict.get('data', {}):
-                    error = result_dict['data']['error']
-            
             return OpenBrowserObservation(
                 success=success,
                 message=message,
@@ -385,95 +540,189 @@ class OpenBrowserExecutor(ToolExecutor[OpenBrowserAction, OpenBrowserObservation
                 tabs=tabs_data,
                 mouse_position=mouse_position,
                 screenshot_data_url=screenshot_data_url,
-                javascript_result=javascript_result
+                javascript_result=javascript_result,
+                screenshot_unchanged=screenshot_unchanged,
             )
             
         except ValueError as e:
             # Provide friendly error message for missing parameters
-            logger.error(f"ValueError (sync): {e} in action '{action.type}'")
+            logger.error("ValueError (sync): %s in action '%s'", e, action.type)
             error_msg = f"Missing or invalid parameters for action '{action.type}': {e}"
-            return OpenBrowserObservation(
-                success=False,
-                error=error_msg,
-                tabs=[],
-                mouse_position=None,
-                screenshot_data_url=None,
-                javascript_result=None
-            )
+            return OpenBrowserObservation(success=False, error=error_msg)
         except Exception as e:
-            logger.debug(f"DEBUG: _execute_action_sync caught exception: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            logger.error(f"Error executing browser action (sync): {e}")
-            return OpenBrowserObservation(
-                success=False,
-                error=str(e),
-                tabs=[],
-                mouse_position=None,
-                screenshot_data_url=None,
-                javascript_result=None
+            logger.exception("Error executing browser action (sync)")
+            return OpenBrowserObservation(success=False, error=str(e))
+    
+    def _observe_options(self, tabs: bool) -> ObservationOptions:
+        """Observation options for a command, carrying our last screenshot hash"""
+        base = self._observe_screenshot_and_tabs if tabs else self._observe_screenshot
+        if self._last_screenshot_hash is None:
+            return base
+        return base.model_copy(update={"known_screenshot_hash": self._last_screenshot_hash})
+    
+    def _do_tab(self, action: OpenBrowserAction) -> tuple:
+        """Run a tab operation; returns (result_dict, message, javascript_result)"""
+        # Validate required parameters
+        if action.action is None:
+            raise ValueError("tab requires action parameter")
+        # Convert action string to TabAction enum
+        action_enum = _parse_tab_action(action.action)
+        if action_enum is None:
+            raise ValueError(f"Invalid tab action: {action.action}")
+
+        if action_enum in _NO_PIXEL_CHANGE_TAB_ACTIONS:
+            # The list is the result itself, so no separate tabs read either
+            observe = None if self._last_screenshot_hash is not None else self._observe_read_only
+        else:
+            # Other tab actions may change the tab list, so refresh it too
+            observe = self._observe_options(tabs=True)
+        if action_enum is TabAction.LIST and observe is None and action.url is None and action.tab_id is None:
+            command = _TAB_LIST_COMMAND
+        else:
+            command = TabCommand(
+                action=action_enum,
+                url=action.url,
+                tab_id=action.tab_id,
+                observe=observe,
             )
+        result_dict = self._execute_command_sync(command)
+
+        message = _TAB_MESSAGES[action_enum].format(url=action.url, tab_id=action.tab_id)
+
+        return result_dict, message, None
+
+    def _do_javascript_execute(self, action: OpenBrowserAction) -> tuple:
+        """Run JavaScript in the current tab; returns (result_dict, message, javascript_result)"""
+        # Validate required parameters
+        if action.script is None:
+            raise ValueError("javascript_execute requires script parameter")
+        javascript_result = None  # Store JavaScript execution result
+        command = JavascriptExecuteCommand(script=action.script, observe=self._observe_options(tabs=False))
+        result_dict = self._execute_command_sync(command)
+
+        # Truncate long scripts for message
+        script = action.script
+        if len(script) > 50:
+            message = f"Executed JavaScript: '{script[:50]}...'"
+        else:
+            message = f"Executed JavaScript: '{script}'"
+
+        # Extract JavaScript execution result for observation
+        if result_dict and result_dict.get('data'):
+            js_data = result_dict['data']
+            # JavaScript module returns result in 'result' field
+            if isinstance(js_data, dict):
+                if 'result' in js_data:
+                    js_result = js_data['result']
+                    # CDP result object has 'value' field when returnByValue is true
+                    if isinstance(js_result, dict) and 'value' in js_result:
+                        javascript_result = js_result['value']
+                    else:
+                        javascript_result = js_result
+                # Also check for direct 'value' in data
+                elif 'value' in js_data:
+                    javascript_result = js_data['value']
+                else:
+                    # If no result or value, use the entire data dict
+                    javascript_result = js_data
+            else:
+                # If data is not a dict (e.g., string error), use it as result
+                javascript_result = js_data
+
+            # If we have a result, update message to include it (only for successful executions)
+            if javascript_result is not None and result_dict.get('success'):
+                result_str = str(javascript_result)
+                if len(result_str) > 100:
+                    result_str = result_str[:100] + '...'
+                message = f"{message} - Result: {result_str}"
+        elif result_dict and result_dict.get('error'):
+            # If there's an error but no data, use error as javascript_result
+            javascript_result = result_dict['error']
+
+        return result_dict, message, javascript_result
+    
+    # Action type -> handler, resolved with one dict lookup per action
+    _ACTION_HANDLERS = {
+        "tab": _do_tab,
+        "javascript_execute": _do_javascript_execute,
+    }
     
     def __call__(self, action: OpenBrowserAction, conversation=None) -> OpenBrowserObservation:
         """Execute a browser action and return observation"""
         # Use synchronous HTTP API to avoid event loop competition with WebSocket
-        logger.debug(f"DEBUG: OpenBrowserTool.__call__ called with action: {action.type}")
-        logger.debug(f"DEBUG: Current thread: {threading.current_thread().name}")
+        logger.debug("OpenBrowserTool.__call__ called with action: %s", action.type)
         
         try:
             # Use synchronous execution (avoids event loop issues)
-            logger.debug(f"DEBUG: Using synchronous HTTP API for tool execution")
             obs = self._execute_action_sync(action)
-            logger.debug(f"DEBUG: OpenBrowserTool.__call__ returning observation: success={obs.success}, message={obs.message}, tabs_count={len(obs.tabs)}, has_screenshot={obs.screenshot_data_url is not None}")
+            logger.debug(
+                "OpenBrowserTool.__call__ returning observation: success=%s, message=%s, tabs_count=%d, has_screenshot=%s",
+                obs.success, obs.message, len(obs.tabs), obs.screenshot_data_url is not None,
+            )
             return obs
                 
-        except Exception as e:
-            logger.debug(f"DEBUG: OpenBrowserTool.__call__ exception: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error in OpenBrowserExecutor")
             raise
     
     def _execute_command_sync(self, command) -> Any:
-        """Execute a command synchronously via HTTP"""
-        logger.debug(f"DEBUG: _execute_command_sync called with command type: {command.type if hasattr(command, 'type') else type(command).__name__}")
+        """Execute a command synchronously on the server's command_processor
+        
+        In-process when running inside the server, else over the shared
+        pooled HTTP client.
+        """
+        logger.debug("_execute_command_sync called with command type: %s", getattr(command, 'type', None) or type(command).__name__)
         try:
+            # Inside the server process, run the command on the server loop
+            # directly: no HTTP round trip and no JSON encoding of the
+            # (screenshot-sized) response
+            if command_processor.loop is not None:
+                result = command_processor.execute_threadsafe(command, timeout=_COMMAND_TIMEOUT).model_dump()
+                logger.debug("_execute_command_sync returned: success=%s", result.get('success'))
+                return result
+            
             # Convert command to dict using model_dump
             cmd_dict = command.model_dump()
-            # Send HTTP POST to server - explicitly disable proxy for localhost
-            response = requests.post(
-                "http://127.0.0.1:8765/command",
-                json=cmd_dict,
-                timeout=30,
-                proxies={'http': None, 'https': None}  # Disable proxy for local connections
-            )
+            # Send HTTP POST to server over the pooled connection; orjson
+            # handles the (screenshot-sized) JSON much faster than stdlib json
+            response = _get_http_client().post("/command", content=orjson.dumps(cmd_dict), headers=_JSON_HEADERS)
             response.raise_for_status()
-            result = response.json()
-            logger.debug(f"DEBUG: _execute_command_sync returned: success={result.get('success')}")
+            result = orjson.loads(response.content)
+            logger.debug("_execute_command_sync returned: success=%s", result.get('success'))
             return result
         except Exception as e:
-            logger.debug(f"DEBUG: _execute_command_sync exception: {e}")
+            logger.debug("_execute_command_sync exception: %s", e)
             raise
 
-    def _get_tabs_sync(self) -> Any:
-        """Get current tab list synchronously"""
-        logger.debug(f"DEBUG: _get_tabs_sync called, sending GetTabsCommand via HTTP")
-        command = GetTabsCommand(managed_only=True)
-        result = self._execute_command_sync(command)
-        logger.debug(f"DEBUG: _get_tabs_sync result: success={result.get('success')}, data keys={list(result.get('data', {}).keys()) if result.get('data') else 'None'}")
-        return result
 
-    def _get_screenshot_sync(self) -> Any:
-        """Capture screenshot synchronously"""
-        logger.debug(f"DEBUG: _get_screenshot_sync called, sending ScreenshotCommand via HTTP")
-        command = ScreenshotCommand(include_cursor=True, include_visual_mouse=True, quality=90)
-        result = self._execute_command_sync(command)
-        logger.debug(f"DEBUG: _get_screenshot_sync result: success={result.get('success')}, data keys={list(result.get('data', {}).keys()) if result.get('data') else 'None'}")
-        return result
+# Executors by id(conv_state), so per-conversation state (last tab list and
+# screenshot hash) survives repeated create() calls for the same conversation.
+# Entries are dropped when their conversation state is garbage collected.
+_executors: Dict[int, OpenBrowserExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(conv_state) -> OpenBrowserExecutor:
+    """Get the executor for a conversation state, creating it on first use"""
+    key = id(conv_state)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = _executors[key] = OpenBrowserExecutor()
+            try:
+                weakref.finalize(conv_state, _executors.pop, key, None)
+            except TypeError:
+                # Can't tell when it goes away (and its id may be reused),
+                # so don't cache
+                del _executors[key]
+    return executor
 
 
 # --- Tool Definition ---
 
-_OPEN_BROWSER_DESCRIPTION = """Browser automation tool for controlling Chrome via JavaScript execution.
+# Built once at import and passed by reference to every tool instance (never
+# formatted or concatenated, which would build a new copy per create())
+_OPEN_BROWSER_DESCRIPTION: Final[str] = """Browser automation tool for controlling Chrome via JavaScript execution.
 
 This tool provides two core capabilities:
 1. **Execute JavaScript** - Interact with web pages, extract data, manipulate DOM
@@ -640,8 +889,8 @@ class OpenBrowserTool(ToolDefinition[OpenBrowserAction, OpenBrowserObservation])
     
     @classmethod
     def create(cls, conv_state, terminal_executor=None) -> Sequence[ToolDefinition]:
-        """Create OpenBrowserTool instance with executor"""
-        executor = OpenBrowserExecutor()
+        """Create OpenBrowserTool instance with the conversation's executor"""
+        executor = _get_executor(conv_state)
         
         return [
             cls(
@@ -1,18 +1,26 @@
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+import gzip
 import logging
 import json
 import asyncio
 from contextlib import asynccontextmanager
 
+import orjson
+
 from server.core.config import config
 from server.core.processor import command_processor
 from server.core.llm_config import llm_config_manager, LLMConfig
 from server.websocket.manager import ws_manager
 from server.models.commands import Command, parse_command, CommandResponse
+from server.agent.tools.open_browser_tool import close_http_client, data_url_mime, decode_data_url
 from server.agent.agent import (
     agent_manager, 
+    initialize_agent,
+    shutdown_conversation_executor,
+    SSEEvent,
+    MSGPACK_SSE_MEDIA_TYPE,
     process_agent_message, 
     create_agent_conversation,
     get_conversation_info, 
@@ -23,6 +31,11 @@ from server.agent.agent import (
 
 logger = logging.getLogger(__name__)
 
+# gzip for large JSON screenshot responses (fast level: the payload is
+# mostly base64, which compresses well even at level 1)
+_GZIP_MIN_SIZE = 10_000
+_GZIP_LEVEL = 1
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -30,22 +43,32 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Local Chrome Server...")
     
+    # Let in-process callers (the agent's browser tool) submit commands
+    # straight to this loop instead of going through the HTTP API
+    command_processor.bind_loop(asyncio.get_running_loop())
+    
+    # Initialize the agent system (after logging is configured)
+    initialize_agent()
+    
     # Start WebSocket server
     try:
         await ws_manager.start(host=config.host, port=config.websocket_port)
-        logger.info(f"WebSocket server started on ws://{config.host}:{config.websocket_port}")
+        logger.info("WebSocket server started on ws://%s:%s", config.host, config.websocket_port)
     except Exception as e:
-        logger.error(f"Failed to start WebSocket server: {e}")
+        logger.error("Failed to start WebSocket server: %s", e)
         logger.error("Extension connectivity will be limited")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Local Chrome Server...")
+    command_processor.bind_loop(None)
+    shutdown_conversation_executor()
+    close_http_client()
     try:
         await ws_manager.stop()
     except Exception as e:
-        logger.error(f"Error stopping WebSocket server: {e}")
+        logger.error("Error stopping WebSocket server: %s", e)
 
 
 # Create FastAPI app
@@ -93,7 +116,9 @@ async def health():
         raise HTTPException(status_code=503, detail="Service unhealthy")
 
 
-@app.post("/command", response_model=CommandResponse)
+# ORJSONResponse: command responses carry screenshot data URLs, which orjson
+# serializes much faster than the default stdlib json encoder
+@app.post("/command", response_model=CommandResponse, response_class=ORJSONResponse)
 async def execute_command(command_data: dict):
     """
     Execute a browser command
@@ -107,6 +132,7 @@ async def execute_command(command_data: dict):
     - screenshot: Capture screenshot
     - tab: Tab management (open, close, switch)
     - get_tabs: Get list of all tabs
+    - batch: Run several of the above in order, in one request
     """
     try:
         # Parse and validate command
@@ -122,7 +148,7 @@ async def execute_command(command_data: dict):
     except ConnectionError as e:
         raise HTTPException(status_code=503, detail=f"No Chrome extension connection: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error executing command: {e}")
+        logger.error("Unexpected error executing command: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -183,7 +209,8 @@ async def keyboard_press(key: str, modifiers: list = None):
 
 
 @app.post("/screenshot")
-async def screenshot(tab_id: int = None, include_cursor: bool = True, include_visual_mouse: bool = True, quality: int = 90):
+async def screenshot(request: Request, tab_id: int = None, include_cursor: bool = True,
+                     include_visual_mouse: bool = True, quality: int = 90):
     """Capture screenshot"""
     command = {
         "type": "screenshot",
@@ -192,7 +219,43 @@ async def screenshot(tab_id: int = None, include_cursor: bool = True, include_vi
         "include_visual_mouse": include_visual_mouse,
         "quality": quality
     }
-    return await execute_command(command)
+    result = await execute_command(command)
+    
+    # The base64 image text shrinks by roughly a quarter under gzip, so
+    # compress it for clients that accept it. This is done per endpoint:
+    # a global GZipMiddleware would buffer the streaming agent responses
+    body = orjson.dumps(result.model_dump(mode="json"))
+    if len(body) >= _GZIP_MIN_SIZE and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=gzip.compress(body, compresslevel=_GZIP_LEVEL),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/screenshot/image")
+async def screenshot_image(tab_id: int = None, include_cursor: bool = True, include_visual_mouse: bool = True,
+                           quality: int = 90, format: str = None):
+    """Capture screenshot and return the raw image bytes (no base64/JSON wrapping)"""
+    command = {
+        "type": "screenshot",
+        "tab_id": tab_id,
+        "include_cursor": include_cursor,
+        "include_visual_mouse": include_visual_mouse,
+        "quality": quality,
+        "format": format
+    }
+    result = await execute_command(command)
+    image_data = (result.data or {}).get("imageData") if result.success else None
+    if not image_data:
+        raise HTTPException(status_code=502, detail=result.error or "Screenshot returned no image data")
+    
+    # imageData is a data URL: data:<mime>;base64,<payload>
+    media_type = data_url_mime(image_data)
+    if media_type is None:
+        raise HTTPException(status_code=502, detail="Screenshot returned an invalid data URL")
+    return Response(content=decode_data_url(image_data), media_type=media_type or "application/octet-stream")
 
 
 @app.post("/tabs")
@@ -235,7 +298,7 @@ async def create_conversation(request: Request):
             "cwd": cwd
         }
     except Exception as e:
-        logger.error(f"Error creating conversation: {e}")
+        logger.error("Error creating conversation: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -247,7 +310,7 @@ async def agent_messages_stream(conversation_id: str, request: Request = None):
     - POST: Send a message and get SSE stream response
     """
     
-    async def event_generator(message_text: str = None, cwd: str = "."):
+    async def event_generator(message_text: str = None, cwd: str = ".", use_msgpack: bool = False):
         """Generate SSE events for the agent conversation"""
         try:
             # If no message text provided, this is a GET request - just open stream
@@ -264,28 +327,35 @@ async def agent_messages_stream(conversation_id: str, request: Request = None):
                         # Send heartbeat comment (SSE comments start with :)
                         yield f": heartbeat {heartbeat_count}\n\n"
                     except asyncio.CancelledError:
-                        logger.debug(f"SSE heartbeat cancelled for conversation {conversation_id}")
+                        logger.debug("SSE heartbeat cancelled for conversation %s", conversation_id)
                         break
             else:
                 # Process the actual message with cwd
-                logger.debug(f"API: Starting SSE event generation for conversation {conversation_id} with cwd={cwd}")
+                logger.debug("API: Starting SSE event generation for conversation %s with cwd=%s", conversation_id, cwd)
                 event_count = 0
-                async for sse_event in process_agent_message(conversation_id, message_text, cwd):
+                async for sse_event in process_agent_message(conversation_id, message_text, cwd, use_msgpack):
                     event_count += 1
-                    logger.debug(f"API: Yielding SSE event #{event_count}: {sse_event[:200] if sse_event else 'None'}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("API: Yielding SSE event #%d (%d bytes)", event_count, len(sse_event))
                     yield sse_event
-                logger.debug(f"API: Finished SSE event generation, yielded {event_count} events")
+                logger.debug("API: Finished SSE event generation, yielded %d events", event_count)
                     
         except ValueError as e:
-            logger.error(f"Error processing agent message: {e}")
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+            logger.error("Error processing agent message: %s", e)
+            if use_msgpack:
+                yield SSEEvent("error", {"error": str(e)}).to_msgpack_frame()
+            else:
+                yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
         except asyncio.CancelledError:
-            logger.debug(f"SSE connection cancelled for conversation {conversation_id}")
+            logger.debug("SSE connection cancelled for conversation %s", conversation_id)
             # Don't yield error on cancellation, just exit cleanly
             raise
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            yield f"event: error\ndata: {json.dumps({'error': 'Internal server error'})}\n\n"
+            logger.error("Unexpected error: %s", e)
+            if use_msgpack:
+                yield SSEEvent("error", {"error": "Internal server error"}).to_msgpack_frame()
+            else:
+                yield f"event: error\ndata: {json.dumps({'error': 'Internal server error'})}\n\n"
     
     # Handle GET request (SSE connection)
     if request.method == "GET":
@@ -309,9 +379,13 @@ async def agent_messages_stream(conversation_id: str, request: Request = None):
             # Extract cwd parameter with default value
             cwd = message_data.get("cwd", ".")
             
+            # Clients with a msgpack shim opt in via the Accept header; everyone
+            # else (including plain EventSource) keeps getting JSON SSE
+            use_msgpack = MSGPACK_SSE_MEDIA_TYPE in request.headers.get("accept", "")
+            
             return StreamingResponse(
-                event_generator(message_data["text"], cwd),
-                media_type="text/event-stream",
+                event_generator(message_data["text"], cwd, use_msgpack),
+                media_type=MSGPACK_SSE_MEDIA_TYPE if use_msgpack else "text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",
                     "Connection": "keep-alive",
@@ -365,7 +439,7 @@ async def get_llm_config():
         }
         return {"success": True, "config": masked_config}
     except Exception as e:
-        logger.error(f"Error getting LLM config: {e}")
+        logger.error("Error getting LLM config: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -404,7 +478,7 @@ async def update_llm_config(request: Request):
             }
         }
     except Exception as e:
-        logger.error(f"Error updating LLM config: {e}")
+        logger.error("Error updating LLM config: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -415,7 +489,7 @@ async def get_default_cwd():
         cwd = llm_config_manager.get_default_cwd()
         return {"success": True, "default_cwd": cwd}
     except Exception as e:
-        logger.error(f"Error getting default CWD: {e}")
+        logger.error("Error getting default CWD: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -444,7 +518,7 @@ async def set_default_cwd(request: Request):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error setting default CWD: {e}")
+        logger.error("Error setting default CWD: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -467,7 +541,7 @@ async def get_full_config():
             }
         }
     except Exception as e:
-        logger.error(f"Error getting full config: {e}")
+        logger.error("Error getting full config: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -521,7 +595,7 @@ async def websocket_endpoint(websocket: WebSocket):
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         await websocket.close(code=1011, reason=str(e))
 
 
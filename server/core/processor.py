@@ -1,15 +1,17 @@
 import asyncio
+import hashlib
 import logging
 import json
 from typing import Dict, Optional, Any, List
 from datetime import datetime
+from functools import lru_cache
 
 from server.models.commands import (
-    Command, CommandResponse, parse_command,
+    Command, CommandResponse, ObservationOptions, parse_command,
     MouseMoveCommand, MouseClickCommand, MouseScrollCommand,
     ResetMouseCommand,
     KeyboardTypeCommand, KeyboardPressCommand, ScreenshotCommand,
-    TabCommand, GetTabsCommand, JavascriptExecuteCommand
+    TabCommand, GetTabsCommand, JavascriptExecuteCommand, BatchCommand, TabAction
 )
 from server.websocket.manager import ws_manager
 from server.core.coordinates import coord_manager
@@ -19,62 +21,70 @@ from server.core.config import config
 logger = logging.getLogger(__name__)
 
 
+# Tab actions that create a tab and make it the current one
+_NEW_TAB_ACTIONS = frozenset((TabAction.INIT, TabAction.OPEN))
+
+# Commands that never get the current tab_id filled in
+_NO_TAB_FILL_COMMANDS = (TabCommand, GetTabsCommand)
+
+# Post-action state reads are invariant per options, so the command models
+# are built once and shared (_prepare_command copies before changing one)
+_OBSERVATION_TABS_COMMAND = GetTabsCommand(managed_only=True)
+
+# Post-action reads that the extension reports as failed (e.g. a transient
+# CDP detach while the page navigates) are retried with exponential backoff
+_OBSERVATION_READ_ATTEMPTS = 3
+_OBSERVATION_RETRY_DELAY = 0.25
+
+
+@lru_cache(maxsize=16)
+def _observation_screenshot_command(quality: int, image_format: Optional[str]) -> ScreenshotCommand:
+    """Screenshot command for post-action observations, built once per options"""
+    return ScreenshotCommand(
+        include_cursor=True,
+        include_visual_mouse=True,
+        quality=quality,
+        format=image_format,
+    )
+
+
 class CommandProcessor:
     """Processes and executes commands"""
     
     def __init__(self):
         self._current_tab_id: Optional[int] = None
+        # Server event loop, for callers on other threads (see execute_threadsafe)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
     
-    def _prepare_command_dict(self, command: Command) -> dict:
-        """
-        Prepare command dictionary for sending to extension.
-        Adds tab_id if not specified and current tab is set.
+    def _prepare_command(self, command: Command, update: Optional[Dict[str, Any]] = None) -> Command:
         """
-        command_dict = command.dict()
-        
-        # Import command types for type checking
-        from server.models.commands import (
-            TabCommand, GetTabsCommand, ScreenshotCommand,
-            MouseMoveCommand, MouseClickCommand, MouseScrollCommand,
-            ResetMouseCommand, KeyboardTypeCommand, KeyboardPressCommand,
-            JavascriptExecuteCommand
-        )
+        Prepare command for sending to extension.
+        Adds tab_id if not specified and current tab is set, plus any
+        per-call field overrides in update.
         
-        # Check if we should auto-fill tab_id
-        should_fill_tab_id = False
-        
-        if hasattr(command, 'tab_id') and command.tab_id is None and self._current_tab_id is not None:
-            # Check command type to decide if we should fill tab_id
-            if isinstance(command, TabCommand):
-                # For tab commands, only fill tab_id for certain actions
-                # init and open create new tabs - don't fill
-                # close and switch need specific tab_id - don't fill if not specified
-                # list gets all tabs - don't fill
-                # So generally don't auto-fill for TabCommand
-                should_fill_tab_id = False
-            elif isinstance(command, GetTabsCommand):
-                # GetTabsCommand gets all tabs, doesn't need tab_id
-                should_fill_tab_id = False
-            else:
-                # For other commands (mouse, keyboard, screenshot, reset_mouse)
-                # auto-fill tab_id to target current managed tab
-                should_fill_tab_id = True
+        Returns the command itself when nothing changes, otherwise a single
+        copy (the fields set here need no re-validation, so the command is
+        not dumped to a dict and parsed back). Shared template commands are
+        never modified.
+        """
+        # Auto-fill tab_id to target the current managed tab, except for
+        # TabCommand (init/open create tabs, close/switch need an explicit
+        # tab_id, list gets all tabs) and GetTabsCommand (gets all tabs)
+        if (
+            command.tab_id is None
+            and self._current_tab_id is not None
+            and not isinstance(command, _NO_TAB_FILL_COMMANDS)
+        ):
+            logger.debug("Auto-filled tab_id %s for %s command", self._current_tab_id, command.type)
+            update = {**update, 'tab_id': self._current_tab_id} if update else {'tab_id': self._current_tab_id}
         
-        if should_fill_tab_id:
-            command_dict['tab_id'] = self._current_tab_id
-            logger.debug(f"Auto-filled tab_id {self._current_tab_id} for {command.type} command")
-            
-        return command_dict
+        return command.model_copy(update=update) if update else command
     
-    async def _send_prepared_command(self, command: Command) -> CommandResponse:
+    async def _send_prepared_command(self, command: Command, update: Optional[Dict[str, Any]] = None) -> CommandResponse:
         """
         Send a command to extension after preparing it with current tab ID.
         """
-        prepared_dict = self._prepare_command_dict(command)
-        # Parse back to Command to ensure validation
-        from server.models.commands import parse_command
-        prepared_command = parse_command(prepared_dict)
-        return await ws_manager.send_command(prepared_command)
+        return await ws_manager.send_command(self._prepare_command(command, update))
         
     async def execute(self, command: Command) -> CommandResponse:
         """
@@ -86,40 +96,107 @@ class CommandProcessor:
         Returns:
             CommandResponse with execution result
         """
-        logger.info(f"Executing command: {command.type}")
+        logger.info("Executing command: %s", command.type)
+        
+        observe = command.observe
+        if observe is not None and observe.overlap:
+            # Read-only command: there is no result to wait for, so capture
+            # alongside it (max of the two instead of their sum)
+            response, observation = await asyncio.gather(
+                self._dispatch(command), self._collect_observation(observe, True)
+            )
+            response.observation = observation
+            return response
+        
+        response = await self._dispatch(command)
+        
+        # Attach the post-action state (even on failure, for context) so the
+        # caller doesn't need separate screenshot/tabs round trips
+        if observe is not None:
+            response.observation = await self._collect_observation(observe, response.success)
         
+        return response
+    
+    async def _dispatch(self, command: Command) -> CommandResponse:
+        """Run a command's handler, turning any error into a failed response"""
         try:
-            # Route to appropriate handler based on command type
-            if isinstance(command, MouseMoveCommand):
-                return await self._execute_mouse_move(command)
-            elif isinstance(command, MouseClickCommand):
-                return await self._execute_mouse_click(command)
-            elif isinstance(command, MouseScrollCommand):
-                return await self._execute_mouse_scroll(command)
-            elif isinstance(command, KeyboardTypeCommand):
-                return await self._execute_keyboard_type(command)
-            elif isinstance(command, KeyboardPressCommand):
-                return await self._execute_keyboard_press(command)
-            elif isinstance(command, ScreenshotCommand):
-                return await self._execute_screenshot(command)
-            elif isinstance(command, TabCommand):
-                return await self._execute_tab_command(command)
-            elif isinstance(command, GetTabsCommand):
-                return await self._execute_get_tabs(command)
-            elif isinstance(command, ResetMouseCommand):
-                return await self._execute_reset_mouse(command)
-            elif isinstance(command, JavascriptExecuteCommand):
-                return await self._execute_javascript_execute(command)
-            else:
+            # Route to the handler for this command type (one dict lookup)
+            handler = self._COMMAND_HANDLERS.get(type(command))
+            if handler is None:
                 raise ValueError(f"Unknown command type: {command.type}")
+            return await handler(self, command)
                 
         except Exception as e:
-            logger.error(f"Error executing command {command.type}: {e}")
+            logger.error("Error executing command %s: %s", command.type, e)
             return CommandResponse(
                 success=False,
                 command_id=getattr(command, 'command_id', None),
                 error=str(e)
             )
+    
+    async def _send_observation_read(
+        self,
+        command: Command,
+        update: Optional[Dict[str, Any]] = None,
+        attempts: int = _OBSERVATION_READ_ATTEMPTS,
+    ) -> CommandResponse:
+        """
+        Send a read-only observation command, retrying if it fails.
+        
+        Only these reads are retried, never the action itself (which could
+        click or type twice). Timeouts and a missing extension connection
+        are raised at once: a retry would only wait longer.
+        """
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(_OBSERVATION_RETRY_DELAY * 2 ** (attempt - 1))
+            response = await self._send_prepared_command(command, update)
+            if response.success:
+                break
+            logger.warning(
+                "Observation %s failed (attempt %d/%d): %s",
+                command.type, attempt + 1, attempts, response.error,
+            )
+        return response
+    
+    async def _collect_observation(self, options: ObservationOptions, action_succeeded: bool) -> dict:
+        """Capture the screenshot (and tab list) after a command, concurrently"""
+        # A failed command changed nothing: no render wait, no tab refresh,
+        # and no retry backoff for the screenshot (it is context only)
+        if action_succeeded and options.settle_delay:
+            await asyncio.sleep(options.settle_delay)
+        
+        # The extension compares hashes and leaves out an identical frame
+        reads = [self._send_observation_read(
+            _observation_screenshot_command(options.screenshot_quality, options.screenshot_format),
+            {'known_hash': options.known_screenshot_hash} if options.known_screenshot_hash else None,
+            _OBSERVATION_READ_ATTEMPTS if action_succeeded else 1,
+        )]
+        if options.tabs and action_succeeded:
+            reads.append(self._send_observation_read(_OBSERVATION_TABS_COMMAND))
+        
+        results = await asyncio.gather(*reads, return_exceptions=True)
+        
+        observation = {"screenshot": None, "tabs": None}
+        # No tabs read was made when it wasn't asked for or the action failed
+        for key, result in zip(("screenshot", "tabs"), results, strict=False):
+            if isinstance(result, BaseException):
+                logger.warning("Failed to get %s for observation: %s", key, result)
+                observation[key] = {"success": False, "error": str(result)}
+            else:
+                observation[key] = result.model_dump()
+        
+        # The extension tags frames with a content hash; fall back to hashing
+        # here for builds that don't, so unchanged frames are still dropped
+        screenshot_data = observation["screenshot"].get("data")
+        image_data = screenshot_data.get("imageData") if isinstance(screenshot_data, dict) else None
+        if image_data and "imageHash" not in screenshot_data:
+            image_hash = hashlib.blake2b(image_data.encode(), digest_size=8).hexdigest()
+            screenshot_data["imageHash"] = image_hash
+            if image_hash == options.known_screenshot_hash:
+                del screenshot_data["imageData"]
+                screenshot_data["unchanged"] = True
+        return observation
             
     async def _execute_mouse_move(self, command: MouseMoveCommand) -> CommandResponse:
         """Execute mouse move command"""
@@ -155,22 +232,17 @@ class CommandProcessor:
         """Execute tab management command"""
         response = await self._send_prepared_command(command)
         
-        # Update current tab based on action
+        # Update current tab based on action (action is already a TabAction
+        # member after validation, so compare by identity)
         if response.success:
-            if command.action == "switch" and command.tab_id:
+            action = command.action
+            if action is TabAction.SWITCH and command.tab_id:
                 self._current_tab_id = command.tab_id
-            elif command.action == "init":
-                # For init action, update current tab to the newly created tab
-                if response.data and 'tabId' in response.data:
-                    self._current_tab_id = response.data['tabId']
-                elif response.data and 'tab_id' in response.data:
-                    self._current_tab_id = response.data['tab_id']
-            elif command.action == "open":
-                # For open action, update current tab to the newly opened tab
-                if response.data and 'tabId' in response.data:
-                    self._current_tab_id = response.data['tabId']
-                elif response.data and 'tab_id' in response.data:
-                    self._current_tab_id = response.data['tab_id']
+            elif action in _NEW_TAB_ACTIONS and response.data:
+                # init/open: update current tab to the newly created tab
+                new_tab_id = response.data.get('tabId', response.data.get('tab_id'))
+                if new_tab_id is not None:
+                    self._current_tab_id = new_tab_id
             
         return response
         
@@ -179,6 +251,24 @@ class CommandProcessor:
         response = await self._send_prepared_command(command)
         return response
         
+    async def _execute_batch(self, command: BatchCommand) -> CommandResponse:
+        """Execute batched commands in order, collecting each response"""
+        results = []
+        for sub_command in command.commands:
+            # execute() never raises, and applies each sub-command's observe
+            response = await self.execute(sub_command)
+            results.append(response.model_dump())
+            if command.stop_on_error and not response.success:
+                break
+        
+        failed = sum(1 for result in results if not result['success'])
+        return CommandResponse(
+            success=failed == 0,
+            command_id=command.command_id,
+            message=f"Executed {len(results)}/{len(command.commands)} commands ({failed} failed)",
+            data={"results": results},
+        )
+        
     async def _execute_reset_mouse(self, command: ResetMouseCommand) -> CommandResponse:
         """Execute reset mouse command"""
         response = await self._send_prepared_command(command)
@@ -189,6 +279,43 @@ class CommandProcessor:
         response = await self._send_prepared_command(command)
         return response
         
+    # Command model -> handler, resolved with one dict lookup per command
+    _COMMAND_HANDLERS = {
+        MouseMoveCommand: _execute_mouse_move,
+        MouseClickCommand: _execute_mouse_click,
+        MouseScrollCommand: _execute_mouse_scroll,
+        KeyboardTypeCommand: _execute_keyboard_type,
+        KeyboardPressCommand: _execute_keyboard_press,
+        ScreenshotCommand: _execute_screenshot,
+        TabCommand: _execute_tab_command,
+        GetTabsCommand: _execute_get_tabs,
+        ResetMouseCommand: _execute_reset_mouse,
+        JavascriptExecuteCommand: _execute_javascript_execute,
+        BatchCommand: _execute_batch,
+    }
+        
+    def bind_loop(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Set (or clear, with None) the server event loop commands run on"""
+        self.loop = loop
+    
+    def execute_threadsafe(self, command: Command, timeout: Optional[float] = None) -> CommandResponse:
+        """
+        Execute a command on the server loop from another thread and wait.
+        
+        For in-process callers (the agent's browser tool) running on worker
+        threads: same result as POST /command, without the HTTP round trip
+        and JSON (de)serialization. Must not be called on the loop's thread.
+        """
+        loop = self.loop
+        if loop is None:
+            raise RuntimeError("Command processor is not bound to a running event loop")
+        future = asyncio.run_coroutine_threadsafe(self.execute(command), loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+        
     def set_current_tab(self, tab_id: int):
         """Set current active tab ID"""
         self._current_tab_id = tab_id
@@ -63,6 +63,7 @@ def serve(host, port, websocket_port, log_level):
     click.echo("   POST /mouse/*       - Mouse control shortcuts")
     click.echo("   POST /keyboard/*    - Keyboard control shortcuts")
     click.echo("   POST /screenshot    - Capture screenshot")
+    click.echo("   POST /screenshot/image - Capture screenshot as raw image bytes")
     click.echo("   POST /tabs          - Tab management")
     click.echo("   GET  /tabs          - List all tabs")
     click.echo("   WS   /ws            - WebSocket for real-time commands")
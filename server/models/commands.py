@@ -26,6 +26,38 @@ class TabAction(str, Enum):
     REFRESH = "refresh"
 
 
+class ObservationOptions(BaseModel):
+    """Post-action browser state to attach to a command's response"""
+    settle_delay: float = Field(
+        default=0.0,
+        ge=0,
+        le=10,
+        description="Seconds to let the page render before capturing (skipped if the command failed)"
+    )
+    screenshot_quality: int = Field(
+        default=90,
+        ge=1,
+        le=100,
+        description="Screenshot quality (1-100)"
+    )
+    screenshot_format: Optional[Literal["png", "jpeg", "webp"]] = Field(
+        default=None,
+        description="Screenshot image format (default: PNG, or JPEG when quality < 90)"
+    )
+    tabs: bool = Field(
+        default=False,
+        description="Also attach the managed tab list (only if the command succeeded)"
+    )
+    known_screenshot_hash: Optional[str] = Field(
+        default=None,
+        description="imageHash of the caller's last screenshot; an identical capture is returned without imageData"
+    )
+    overlap: bool = Field(
+        default=False,
+        description="Capture concurrently with the command instead of after it (only for commands that don't change the page)"
+    )
+
+
 class BaseCommand(BaseModel):
     """Base command model with common fields"""
     command_id: Optional[str] = Field(
@@ -40,6 +72,10 @@ class BaseCommand(BaseModel):
         default=None,
         description="Tab ID to target (None = current managed tab)"
     )
+    observe: Optional[ObservationOptions] = Field(
+        default=None,
+        description="If set, the response also carries a screenshot (and tab list) taken after the command"
+    )
 
 
 class MouseMoveCommand(BaseCommand):
@@ -125,6 +161,14 @@ class ScreenshotCommand(BaseCommand):
         le=100,
         description="JPEG quality (1-100)"
     )
+    format: Optional[Literal["png", "jpeg", "webp"]] = Field(
+        default=None,
+        description="Image format (default: PNG, or JPEG when quality < 90)"
+    )
+    known_hash: Optional[str] = Field(
+        default=None,
+        description="Hash of a frame the caller already has; image data is omitted when unchanged"
+    )
 
 
 class TabCommand(BaseCommand):
@@ -186,6 +230,10 @@ class CommandResponse(BaseModel):
     message: Optional[str] = None
     error: Optional[str] = None
     data: Optional[dict] = None
+    observation: Optional[dict] = Field(
+        default=None,
+        description="Post-action state requested via observe: {'screenshot': response, 'tabs': response or None}"
+    )
     timestamp: float = Field(default_factory=lambda: time.time())
 
 
@@ -220,8 +268,21 @@ Command = Union[
 ]
 
 
+class BatchCommand(BaseCommand):
+    """Run several commands in order within a single request"""
+    type: Literal["batch"] = "batch"
+    commands: List[Command] = Field(
+        min_length=1,
+        description="Commands to execute, in order (batches cannot be nested)"
+    )
+    stop_on_error: bool = Field(
+        default=False,
+        description="Stop at the first failed command instead of running the rest"
+    )
+
+
 # Helper function to parse command from dict
-def parse_command(data: dict) -> Command:
+def parse_command(data: dict) -> Union[Command, BatchCommand]:
     """Parse command from dictionary based on type field"""
     cmd_type = data.get('type')
     if not cmd_type:
@@ -238,6 +299,7 @@ def parse_command(data: dict) -> Command:
         "tab": TabCommand,
         "get_tabs": GetTabsCommand,
         "javascript_execute": JavascriptExecuteCommand,
+        "batch": BatchCommand,
     }
     
     if cmd_type not in command_map:
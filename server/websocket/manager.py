@@ -1,8 +1,8 @@
 import asyncio
-import json
 import logging
 import time
 from typing import Dict, Optional, Set, Callable, Any
+import orjson
 from websockets.server import WebSocketServerProtocol, serve
 from websockets.exceptions import ConnectionClosed
 
@@ -58,13 +58,13 @@ class WebSocketManager:
             self.connections.add(websocket)
             
             # Send welcome message
-            welcome_msg = json.dumps({
+            welcome_msg = orjson.dumps({
                 "type": "connected",
                 "message": "Connected to Local Chrome Server",
                 "timestamp": time.time()
-            })
+            }).decode()
             await websocket.send(welcome_msg)
-            logger.debug(f"Sent welcome message to {client_address}")
+            logger.debug("Sent welcome message to %s", client_address)
             
             # Handle messages until connection closes
             try:
@@ -73,10 +73,8 @@ class WebSocketManager:
             except ConnectionClosed as e:
                 logger.info(f"WebSocket connection closed from {client_address}: {e.code} {e.reason}")
                 
-        except Exception as e:
-            logger.error(f"Error handling WebSocket connection from {client_address}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error handling WebSocket connection from %s", client_address)
         finally:
             if websocket in self.connections:
                 self.connections.remove(websocket)
@@ -85,11 +83,16 @@ class WebSocketManager:
     async def _handle_message(self, message: str, websocket: WebSocketServerProtocol):
         """Handle incoming WebSocket message"""
         try:
-            data = json.loads(message)
+            # orjson: screenshot responses are hundreds of KB of JSON
+            data = orjson.loads(message)
             msg_type = data.get("type")
             
-            # Debug log to see what we're receiving
-            logger.debug(f"Received WebSocket message: {data}")
+            # Debug log to see what we're receiving (not the payload itself:
+            # screenshot responses are hundreds of KB)
+            logger.debug(
+                "Received WebSocket message: type=%s, command_id=%s, %d bytes",
+                msg_type, data.get("command_id"), len(message),
+            )
             
             if msg_type == "command_response":
                 await self._handle_command_response(data)
@@ -99,16 +102,16 @@ class WebSocketManager:
                 await self._send_pong(websocket)
             elif "command_id" in data:
                 # If message has command_id but no type, treat it as command response
-                logger.debug(f"Message has command_id but no type, treating as command response")
+                logger.debug("Message has command_id but no type, treating as command response")
                 await self._handle_command_response(data)
             else:
-                logger.warning(f"Unknown message type: {msg_type}, data: {data}")
+                logger.warning("Unknown message type: %s, data: %s", msg_type, data)
                 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON received: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid JSON received: %s", e)
             await self._send_error(websocket, "Invalid JSON format")
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             await self._send_error(websocket, f"Internal error: {e}")
             
     async def _handle_command_response(self, data: dict):
@@ -119,32 +122,33 @@ class WebSocketManager:
             if not future.done():
                 future.set_result(data)
         else:
-            logger.warning(f"Response for unknown command_id: {command_id}")
+            logger.warning("Response for unknown command_id: %s", command_id)
             
     async def _handle_event(self, data: dict):
         """Handle event from extension"""
         event_type = data.get("event_type")
-        logger.info(f"Received event: {event_type}")
+        logger.info("Received event: %s", event_type)
         # TODO: Implement event handlers
         
     async def _send_pong(self, websocket: WebSocketServerProtocol):
         """Send pong response"""
-        await websocket.send(json.dumps({"type": "pong"}))
+        await websocket.send(orjson.dumps({"type": "pong"}).decode())
         
     async def _send_error(self, websocket: WebSocketServerProtocol, error: str):
         """Send error message"""
-        await websocket.send(json.dumps({
+        await websocket.send(orjson.dumps({
             "type": "error",
             "error": error
-        }))
+        }).decode())
         
     async def send_command(self, command: Command) -> CommandResponse:
         """Send command to extension and wait for response"""
         if not self.connections:
             raise ConnectionError("No WebSocket connections available")
             
-        # Convert command to dict
-        command_dict = command.dict()
+        # Convert command to dict (observe is handled by the server, the
+        # extension never sees it)
+        command_dict = command.dict(exclude={'observe'})
         if not command_dict.get("command_id"):
             import uuid
             command_dict["command_id"] = str(uuid.uuid4())
@@ -154,14 +158,15 @@ class WebSocketManager:
         self.response_waiters[command_dict["command_id"]] = future
         
         # Send command to all connections (extension should handle duplicates)
-        message = json.dumps(command_dict)
+        # Sent as text (str), since the extension handles text frames only
+        message = orjson.dumps(command_dict).decode()
         sent = False
         for connection in self.connections:
             try:
                 await connection.send(message)
                 sent = True
             except Exception as e:
-                logger.error(f"Failed to send command to connection: {e}")
+                logger.error("Failed to send command to connection: %s", e)
                 
         if not sent:
             self.response_waiters.pop(command_dict["command_id"], None)
@@ -0,0 +1,8 @@
+"""Shared pytest configuration"""
+
+import os
+
+# Keep litellm (imported by the agent SDK) from fetching its model cost map
+# over the network at import time, and the SDK from printing its banner
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+os.environ.setdefault("OPENHANDS_SUPPRESS_BANNER", "1")
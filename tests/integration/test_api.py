@@ -0,0 +1,45 @@
+"""Tests for the REST API"""
+
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server.api import main
+from server.models.commands import CommandResponse
+
+
+IMAGE = b"RIFF\x00\x00\x00\x00WEBPVP8 "
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager, so the lifespan (WebSocket server,
+    # agent setup) does not run
+    return TestClient(main.app)
+
+
+def _screenshot_returns(monkeypatch, image_data):
+    async def execute_command(command):
+        return CommandResponse(success=True, data={"imageData": image_data})
+
+    monkeypatch.setattr(main, "execute_command", execute_command)
+
+
+def test_screenshot_image_returns_raw_bytes(client, monkeypatch):
+    _screenshot_returns(monkeypatch, "data:image/webp;base64," + base64.b64encode(IMAGE).decode())
+
+    response = client.post("/screenshot/image")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert response.content == IMAGE
+
+
+@pytest.mark.parametrize("image_data", ["not a data url", "data:image/png,raw", "UklGRg=="])
+def test_screenshot_image_rejects_invalid_data_url(client, monkeypatch, image_data):
+    _screenshot_returns(monkeypatch, image_data)
+
+    response = client.post("/screenshot/image")
+
+    assert response.status_code == 502
@@ -0,0 +1,133 @@
+"""Tests for the agent manager and conversation plumbing"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from server.agent import agent
+
+
+def test_conversation_executor_is_recreated_after_shutdown():
+    executor = agent._get_conversation_executor()
+    assert agent._get_conversation_executor() is executor
+    assert executor.submit(lambda: 42).result() == 42
+
+    agent.shutdown_conversation_executor()
+
+    assert agent._conversation_executor is None
+    replacement = agent._get_conversation_executor()
+    assert replacement is not executor
+    agent.shutdown_conversation_executor()
+
+
+class FakeConversation:
+    """Stands in for the SDK Conversation; construction blocks until released"""
+
+    entered = None
+    release = None
+    fail_next = False
+    created = 0
+
+    def __init__(self, agent, visualizer, workspace):
+        self.agent = agent
+        cls = type(self)
+        cls.entered.set()
+        assert cls.release.wait(5)
+        if cls.fail_next:
+            cls.fail_next = False
+            raise RuntimeError("workspace unavailable")
+        cls.created += 1
+
+    def run(self):
+        pass
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(agent, "Agent", lambda **kwargs: object())
+    monkeypatch.setattr(agent, "AgentContext", lambda **kwargs: None)
+    monkeypatch.setattr(FakeConversation, "entered", threading.Event())
+    monkeypatch.setattr(FakeConversation, "release", threading.Event())
+    monkeypatch.setattr(FakeConversation, "created", 0)
+    monkeypatch.setattr(agent, "Conversation", FakeConversation)
+    manager = agent.OpenBrowserAgentManager()
+    manager._llm = object()
+    return manager
+
+
+def _race_get_or_create(manager, conversation_id):
+    """Start two get_or_create calls for one ID, the second while the first builds it"""
+    pool = ThreadPoolExecutor(max_workers=2)
+    first = pool.submit(manager.get_or_create_conversation, conversation_id)
+    assert FakeConversation.entered.wait(5)
+    second = pool.submit(manager.get_or_create_conversation, conversation_id)
+    # The second caller waits on the reservation rather than failing
+    assert not second.done()
+    FakeConversation.release.set()
+    pool.shutdown(wait=True)
+    return first, second
+
+
+def test_concurrent_get_or_create_waits_for_reservation(manager):
+    first, second = _race_get_or_create(manager, "conv-1")
+
+    assert first.result() is second.result()
+    assert FakeConversation.created == 1
+    assert [row["id"] for row in manager.list_conversations()] == ["conv-1"]
+
+
+def test_waiting_get_or_create_retries_after_failed_creation(manager):
+    FakeConversation.fail_next = True
+
+    first, second = _race_get_or_create(manager, "conv-1")
+
+    with pytest.raises(RuntimeError):
+        first.result()
+    assert second.result().conversation_id == "conv-1"
+    assert FakeConversation.created == 1
+
+
+def test_listing_stays_consistent_under_concurrent_create_and_delete(manager):
+    FakeConversation.release.set()
+    ids = [f"conv-{i}" for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(manager.get_or_create_conversation, ids))
+        deleted = list(pool.map(manager.delete_conversation, ids[::2]))
+
+    assert all(deleted)
+    listed = [row["id"] for row in manager.list_conversations()]
+    assert sorted(listed) == sorted(ids[1::2])
+    assert all(
+        manager._conversation_ids[row] == conv_id
+        for conv_id, row in manager._conversation_rows.items()
+    )
+
+
+def test_delete_during_creation_leaves_the_reservation(manager):
+    FakeConversation.fail_next = True
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        creating = pool.submit(manager.get_or_create_conversation, "conv-1")
+        assert FakeConversation.entered.wait(5)
+
+        assert manager.delete_conversation("conv-1") is False
+        FakeConversation.release.set()
+        with pytest.raises(RuntimeError):
+            creating.result()
+
+    # The failed creation removed its own reservation, so the ID is free
+    assert "conv-1" not in manager.conversations
+    assert manager.get_or_create_conversation("conv-1").conversation_id == "conv-1"
+
+
+def test_get_or_create_replaces_a_stale_reservation(manager):
+    FakeConversation.release.set()
+    stale = agent._Reservation()
+    stale.done.set()
+    manager.conversations["conv-1"] = stale
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        conv_state = pool.submit(manager.get_or_create_conversation, "conv-1").result(timeout=5)
+
+    assert conv_state.conversation_id == "conv-1"
+    assert manager.conversations["conv-1"] is conv_state
@@ -0,0 +1,139 @@
+"""Tests for the open_browser tool executor"""
+
+import asyncio
+
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from server.agent.tools import open_browser_tool
+from server.agent.tools.open_browser_tool import (
+    OpenBrowserAction,
+    OpenBrowserExecutor,
+)
+from server.core import processor as processor_module
+from server.core.processor import command_processor
+from server.models.commands import CommandResponse, TabAction, TabCommand
+
+
+TABS = [{"id": 1, "title": "Example", "url": "https://example.com", "active": True}]
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = OpenBrowserExecutor()
+    executor.commands = []
+
+    def fake_execute(command):
+        executor.commands.append(command)
+        return {"success": True, "data": {"tabs": TABS}}
+
+    monkeypatch.setattr(executor, "_execute_command_sync", fake_execute)
+    return executor
+
+
+@pytest.mark.parametrize("action", ["list", "List", "LIST"])
+def test_tab_list_reports_tabs_for_any_casing(executor, action):
+    obs = executor(OpenBrowserAction(type="tab", action=action))
+
+    assert obs.success
+    assert obs.tabs == TABS
+    assert executor._last_tabs_data == TABS
+
+
+def test_error_observations_render_their_own_error(monkeypatch):
+    executor = OpenBrowserExecutor()
+
+    def fail(command):
+        raise RuntimeError(f"boom {command.action.value}")
+
+    monkeypatch.setattr(executor, "_execute_command_sync", fail)
+
+    first = executor(OpenBrowserAction(type="tab", action="list"))
+    first_text = first.to_llm_content[0].text
+    second = executor(OpenBrowserAction(type="tab", action="refresh", tab_id=3))
+    invalid = executor(OpenBrowserAction(type="tab", action="bogus"))
+
+    assert "boom list" in first_text
+    assert "boom refresh" in second.to_llm_content[0].text
+    assert "Invalid tab action: bogus" in invalid.to_llm_content[0].text
+    assert first.tabs is not second.tabs
+
+
+# --- Command transport ---
+
+async def test_command_runs_on_bound_server_loop(monkeypatch):
+    loop = asyncio.get_running_loop()
+    loops = []
+
+    async def send_command(command):
+        loops.append(asyncio.get_running_loop())
+        return CommandResponse(success=True, data={"tabs": TABS})
+
+    def no_http_client():
+        raise AssertionError("HTTP client used while a loop is bound")
+
+    monkeypatch.setattr(processor_module.ws_manager, "send_command", send_command)
+    monkeypatch.setattr(open_browser_tool, "_get_http_client", no_http_client)
+    monkeypatch.setattr(command_processor, "loop", loop)
+    executor = OpenBrowserExecutor()
+
+    # The agent calls the tool from a worker thread
+    result = await asyncio.to_thread(executor._execute_command_sync, TabCommand(action=TabAction.LIST))
+
+    assert result["success"]
+    assert result["data"] == {"tabs": TABS}
+    assert loops == [loop]
+
+
+class FakeHTTPResponse:
+    def __init__(self, body):
+        self.content = orjson.dumps(body)
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeHTTPClient:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, path, content, headers):
+        self.posts.append((path, orjson.loads(content)))
+        return FakeHTTPResponse({"success": True, "data": {"tabs": TABS}})
+
+
+def test_command_uses_http_client_without_bound_loop(monkeypatch):
+    client = FakeHTTPClient()
+    monkeypatch.setattr(open_browser_tool, "_get_http_client", lambda: client)
+    monkeypatch.setattr(command_processor, "loop", None)
+    executor = OpenBrowserExecutor()
+
+    result = executor._execute_command_sync(TabCommand(action=TabAction.LIST))
+
+    assert result == {"success": True, "data": {"tabs": TABS}}
+    [(path, body)] = client.posts
+    assert path == "/command"
+    assert body["type"] == "tab"
+    assert body["action"] == "list"
+
+
+@pytest.mark.parametrize("data_url, mime", [
+    ("data:image/webp;base64,UklGRg==", "image/webp"),
+    ("data:image/png;base64,", "image/png"),
+    ("data:image/png,raw", None),
+    ("image/png;base64,AAAA", None),
+    ("UklGRg==", None),
+])
+def test_data_url_mime(data_url, mime):
+    assert open_browser_tool.data_url_mime(data_url) == mime
+
+
+def test_screenshot_format_is_validated_at_construction():
+    executor = OpenBrowserExecutor(screenshot_format="png")
+    assert executor._observe_screenshot.screenshot_format == "png"
+    assert executor._observe_screenshot_and_tabs.tabs
+    assert executor._observe_read_only.overlap
+
+    with pytest.raises(ValidationError):
+        OpenBrowserExecutor(screenshot_format="gif")
@@ -0,0 +1,212 @@
+"""Tests for the command processor"""
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from server.core import processor as processor_module
+from server.core.processor import CommandProcessor
+from server.models.commands import (
+    BatchCommand,
+    CommandResponse,
+    KeyboardPressCommand,
+    KeyboardTypeCommand,
+    MouseMoveCommand,
+    ObservationOptions,
+    parse_command,
+)
+
+
+SCREENSHOT_DATA = {"imageData": "data:image/webp;base64,AAAA", "imageHash": "hash-1"}
+
+
+class FakeExtension:
+    """Stands in for ws_manager.send_command, recording every command sent"""
+
+    def __init__(self):
+        self.sent = []
+        # Command type -> list of responses handed out in order (the last
+        # one repeats); types not listed succeed
+        self.responses = {}
+
+    async def send_command(self, command):
+        self.sent.append(command)
+        queued = self.responses.get(command.type)
+        if queued:
+            response = queued.pop(0) if len(queued) > 1 else queued[0]
+            if isinstance(response, BaseException):
+                raise response
+            return response.model_copy()
+        data = SCREENSHOT_DATA if command.type == "screenshot" else None
+        return CommandResponse(success=True, command_id=command.command_id, data=data)
+
+    @property
+    def sent_types(self):
+        return [command.type for command in self.sent]
+
+
+@pytest.fixture
+def extension(monkeypatch):
+    extension = FakeExtension()
+    monkeypatch.setattr(processor_module.ws_manager, "send_command", extension.send_command)
+    return extension
+
+
+@pytest.fixture
+def processor():
+    return CommandProcessor()
+
+
+def failure(error="failed"):
+    return CommandResponse(success=False, error=error)
+
+
+# --- Batch ---
+
+async def test_batch_runs_sub_commands_in_order(processor, extension):
+    batch = BatchCommand(commands=[
+        MouseMoveCommand(x=1, y=2),
+        KeyboardTypeCommand(text="hello"),
+        KeyboardPressCommand(key="Enter"),
+    ])
+
+    response = await processor.execute(batch)
+
+    assert extension.sent_types == ["mouse_move", "keyboard_type", "keyboard_press"]
+    assert response.success
+    assert [result["success"] for result in response.data["results"]] == [True, True, True]
+
+
+@pytest.mark.parametrize("stop_on_error, expected_sent", [
+    (True, ["mouse_move", "keyboard_type"]),
+    (False, ["mouse_move", "keyboard_type", "keyboard_press"]),
+])
+async def test_batch_stop_on_error(processor, extension, stop_on_error, expected_sent):
+    extension.responses["keyboard_type"] = [failure("no focus")]
+    batch = BatchCommand(
+        commands=[
+            MouseMoveCommand(x=1, y=2),
+            KeyboardTypeCommand(text="hello"),
+            KeyboardPressCommand(key="Enter"),
+        ],
+        stop_on_error=stop_on_error,
+    )
+
+    response = await processor.execute(batch)
+
+    assert extension.sent_types == expected_sent
+    assert not response.success
+    assert len(response.data["results"]) == len(expected_sent)
+    assert response.data["results"][1]["error"] == "no focus"
+
+
+def test_nested_batch_is_rejected():
+    with pytest.raises(ValidationError):
+        parse_command({
+            "type": "batch",
+            "commands": [{"type": "batch", "commands": [{"type": "reset_mouse"}]}],
+        })
+
+
+async def test_batch_applies_each_sub_commands_observe(processor, extension):
+    observe = ObservationOptions(settle_delay=0.0)
+    batch = BatchCommand(commands=[
+        MouseMoveCommand(x=1, y=2),
+        KeyboardTypeCommand(text="hello", observe=observe),
+    ])
+
+    response = await processor.execute(batch)
+
+    assert extension.sent_types == ["mouse_move", "keyboard_type", "screenshot"]
+    first, second = response.data["results"]
+    assert first["observation"] is None
+    assert second["observation"]["screenshot"]["data"] == SCREENSHOT_DATA
+    assert second["observation"]["tabs"] is None
+
+
+# --- Post-action observation reads ---
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record asyncio.sleep delays in the processor instead of waiting"""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(processor_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+async def test_observation_read_succeeds_after_transient_failure(processor, extension, sleeps):
+    extension.responses["screenshot"] = [
+        failure("Debugger detached"),
+        CommandResponse(success=True, data=SCREENSHOT_DATA),
+    ]
+    command = MouseMoveCommand(x=1, y=2, observe=ObservationOptions(settle_delay=0.0))
+
+    response = await processor.execute(command)
+
+    assert extension.sent_types == ["mouse_move", "screenshot", "screenshot"]
+    assert sleeps == [processor_module._OBSERVATION_RETRY_DELAY]
+    assert response.observation["screenshot"]["success"]
+    assert response.observation["screenshot"]["data"] == SCREENSHOT_DATA
+
+
+async def test_observation_degrades_when_reads_keep_failing(processor, extension, sleeps):
+    extension.responses["screenshot"] = [failure("Debugger detached")]
+    extension.responses["get_tabs"] = [failure("No tabs")]
+    command = MouseMoveCommand(x=1, y=2, observe=ObservationOptions(settle_delay=0.0, tabs=True))
+
+    response = await processor.execute(command)
+
+    attempts = processor_module._OBSERVATION_READ_ATTEMPTS
+    assert extension.sent_types.count("screenshot") == attempts
+    assert extension.sent_types.count("get_tabs") == attempts
+    assert response.success
+    observation = response.observation
+    assert not observation["screenshot"]["success"]
+    assert observation["screenshot"]["data"] is None
+    assert not observation["tabs"]["success"]
+
+
+async def test_failed_command_observation_skips_settle_and_backoff(processor, extension, sleeps):
+    extension.responses["mouse_move"] = [failure("Out of bounds")]
+    extension.responses["screenshot"] = [failure("Debugger detached")]
+    command = MouseMoveCommand(x=1, y=2, observe=ObservationOptions(settle_delay=1.0, tabs=True))
+
+    response = await processor.execute(command)
+
+    assert not response.success
+    assert extension.sent_types == ["mouse_move", "screenshot"]
+    assert sleeps == []
+    assert response.observation["tabs"] is None
+
+
+# --- Cross-thread execution ---
+
+async def test_execute_threadsafe_runs_on_bound_loop(processor, extension, monkeypatch):
+    loop = asyncio.get_running_loop()
+    send = extension.send_command
+    loops = []
+
+    async def recording_send(command):
+        loops.append(asyncio.get_running_loop())
+        return await send(command)
+
+    monkeypatch.setattr(processor_module.ws_manager, "send_command", recording_send)
+    processor.bind_loop(loop)
+
+    response = await asyncio.to_thread(processor.execute_threadsafe, MouseMoveCommand(x=1, y=2), 5)
+
+    assert response.success
+    assert extension.sent_types == ["mouse_move"]
+    assert loops == [loop]
+
+
+def test_execute_threadsafe_requires_bound_loop(processor):
+    processor.bind_loop(None)
+
+    with pytest.raises(RuntimeError):
+        processor.execute_threadsafe(MouseMoveCommand(x=1, y=2))
@@ -0,0 +1,86 @@
+"""Round-trip tests for the agent stream's MessagePack frames"""
+
+import base64
+import json
+import re
+import shutil
+import struct
+import subprocess
+from pathlib import Path
+
+import msgpack
+import pytest
+
+from server.agent.agent import SSEEvent
+
+
+SCREENSHOT = bytes(range(256)) * 4
+EVENTS = [
+    SSEEvent("agent_event", {
+        "type": "ObservationEvent",
+        "text": "Clicked — done",
+        "timestamp": "2026-01-01T00:00:00",
+        "success": True,
+        "error": None,
+        "count": 70000,
+        "offset": -3,
+        "ratio": 0.5,
+        "image": "data:image/webp;base64," + base64.b64encode(SCREENSHOT).decode(),
+    }),
+    SSEEvent("backpressure", {"conversation_id": "conv-1", "dropped": 3}),
+    SSEEvent("complete", {"conversation_id": "conv-1", "message": "Conversation completed"}),
+]
+
+FRONTEND = Path(__file__).resolve().parents[2] / "frontend" / "index.html"
+
+
+def _expected(event):
+    """Frame contents: the image data URL becomes raw bytes plus its MIME type"""
+    data = dict(event.data)
+    if "image" in data:
+        data["image"] = SCREENSHOT
+        data["image_mime"] = "image/webp"
+    return {"event": event.event_type, "data": data}
+
+
+def test_msgpack_frames_round_trip():
+    stream = b"".join(event.to_msgpack_frame() for event in EVENTS)
+
+    decoded = []
+    while stream:
+        (length,) = struct.unpack(">I", stream[:4])
+        decoded.append(msgpack.unpackb(stream[4:4 + length], raw=False))
+        stream = stream[4 + length:]
+
+    assert decoded == [_expected(event) for event in EVENTS]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_frontend_decoder_round_trip(tmp_path):
+    decoder = re.search(
+        r'<script id="msgpack-sse-decoder">(.*?)</script>', FRONTEND.read_text(), re.S
+    ).group(1)
+    stream = b"".join(event.to_msgpack_frame() for event in EVENTS)
+    # Feed the stream in small uneven chunks so frames span chunk boundaries
+    script = tmp_path / "decode.js"
+    script.write_text(decoder + """
+        const stream = new Uint8Array(require('fs').readFileSync(0));
+        const frames = [];
+        const pushChunk = createMsgpackFrameReader(frame => frames.push(frame));
+        for (let offset = 0; offset < stream.length; offset += 7) {
+            pushChunk(stream.subarray(offset, offset + 7));
+        }
+        process.stdout.write(JSON.stringify(frames, (key, value) =>
+            value instanceof Uint8Array ? {bytes: Array.from(value)} : value));
+    """)
+
+    result = subprocess.run(
+        ["node", str(script)], input=stream, capture_output=True, check=True, timeout=30
+    )
+    frames = json.loads(result.stdout)
+
+    for frame in frames:
+        image = frame["data"].get("image")
+        if image is not None:
+            frame["data"]["image"] = bytes(image["bytes"])
+    assert frames == [_expected(event) for event in EVENTS]